@@ -2,18 +2,188 @@
 
 import requests, json
 from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from requests import ConnectionError
 import logging
 import uuid
 import os
 from xml.etree.ElementTree import ParseError
 from xml.etree import ElementTree as ET
+from xml.parsers import expat
 import base64
 import subprocess
+import shlex
 import yaml
 from datetime import datetime
 import time
 import hashlib
+import re
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Paths (below the root element) of the elements in corpus.xml that contain the metadata of a corpus; tags are in the
+# "{namespace}tag" notation of ElementTree
+_TEI_NS = "{http://www.tei-c.org/ns/1.0}"
+_CORPUS_XML_HEADER_PATH = [f"{_TEI_NS}teiHeader"]
+_CORPUS_XML_TITLE_PATH = _CORPUS_XML_HEADER_PATH + [f"{_TEI_NS}fileDesc", f"{_TEI_NS}titleStmt", f"{_TEI_NS}title"]
+_CORPUS_XML_NAME_PATH = _CORPUS_XML_HEADER_PATH + [f"{_TEI_NS}fileDesc", f"{_TEI_NS}publicationStmt",
+                                                   f"{_TEI_NS}idno"]
+_CORPUS_XML_DESCRIPTION_PATH = _CORPUS_XML_HEADER_PATH + [f"{_TEI_NS}encodingDesc", f"{_TEI_NS}projectDesc",
+                                                          f"{_TEI_NS}p"]
+
+# Requests to the GitHub API for git trees and blobs by a full SHA (of the object or of a commit); the responses to
+# these requests never change
+_GITHUB_OBJECT_BY_SHA = re.compile(r"/repos/([^/]+)/([^/]+)/git/(trees|blobs)/([0-9a-f]{40})(\?recursive=1)?$")
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_available() -> bool:
+    """Check if Docker is installed and can execute commands. The check runs once per process.
+
+    Returns:
+        bool: True if the docker command reports a version.
+    """
+    try:
+        run_check = subprocess.run(["docker", "--version"], capture_output=True)
+    except FileNotFoundError:
+        return False
+
+    return b"Docker version" in run_check.stdout
+
+
+@functools.lru_cache(maxsize=1)
+def _default_session() -> requests.Session:
+    """Session that the module functions send requests with if no session is passed. It is created once per process
+    and keeps the connections to a server alive, so that consecutive requests to the same API re-use them.
+
+    Returns:
+        requests.Session: Shared session without credentials
+    """
+    return requests.Session()
+
+
+def _is_well_formed_xml_data(data: bytes) -> bool:
+    """Check if data is well-formed XML. The data is read by the expat parser without building a tree.
+
+    Args:
+        data (bytes): XML document
+
+    Returns:
+        bool: True if the data is well-formed.
+    """
+    try:
+        expat.ParserCreate().Parse(data, True)
+    except expat.ExpatError:
+        return False
+
+    return True
+
+
+def _read_well_formed_xml(f, chunk_size: int = 65536):
+    """Read an XML document from a file object and check that it is well-formed while it is read.
+
+    The file is read and fed to the expat parser in large chunks, without building a tree; ParseFile would read it in
+    pieces of a few kilobytes, each of them a call to read() of the file object. Reading stops at the first error, so
+    a malformed file is not read to the end.
+
+    Args:
+        f: File object opened in binary mode
+        chunk_size (int, optional): Number of bytes read and passed to the parser at once. Defaults to 64 KiB.
+
+    Returns:
+        bytes: Contents of the file, or None if it is not well-formed XML.
+    """
+    parser = expat.ParserCreate()
+    chunks = []
+    try:
+        while chunk := f.read(chunk_size):
+            parser.Parse(chunk, False)
+            chunks.append(chunk)
+        parser.Parse(b"", True)
+    except expat.ExpatError:
+        return None
+
+    return b"".join(chunks)
+
+
+def _iter_base64_decoded(content: str, chunk_size: int = 65536):
+    """Decode base64 encoded content, e.g. of a blob returned by the GitHub API, chunk by chunk.
+
+    Args:
+        content (str): Base64 encoded data; line breaks are ignored.
+        chunk_size (int, optional): Number of base64 characters decoded at a time. Must be a multiple of 4.
+
+    Yields:
+        bytes: Decoded chunk
+    """
+    content = content.replace("\n", "")
+    for offset in range(0, len(content), chunk_size):
+        yield base64.b64decode(content[offset:offset + chunk_size])
+
+
+def _extract_corpus_metadata(data) -> dict:
+    """Extract the title, the identifier 'corpusname' and the description of a corpus from its corpus.xml.
+
+    The document is parsed incrementally; parsing stops at the end of the teiHeader and elements are discarded as soon
+    as they have been read.
+
+    Args:
+        data (bytes or iterable): Contents of corpus.xml, either as a whole or in chunks of bytes
+            (see _iter_base64_decoded).
+
+    Returns:
+        dict: Metadata of the corpus, i.e. "title", "name" and "description" if they are found.
+    """
+    metadata = {}
+    description_texts = []
+    # tags of the open elements, starting with the root element
+    path = []
+    header_read = False
+
+    # the document is fed in chunks to be able to stop at the end of the teiHeader
+    chunks = data
+    if isinstance(data, bytes):
+        chunk_size = 65536
+        chunks = (data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size))
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+
+    for chunk in chunks:
+        if header_read is True:
+            break
+
+        parser.feed(chunk)
+
+        for event, elem in parser.read_events():
+            if event == "start":
+                path.append(elem.tag)
+                continue
+
+            element_path = path[1:]
+            if element_path == _CORPUS_XML_TITLE_PATH and "title" not in metadata:
+                metadata["title"] = elem.text
+            elif element_path == _CORPUS_XML_NAME_PATH and elem.get("type") == "URI" and "name" not in metadata:
+                metadata["name"] = elem.text
+            elif element_path == _CORPUS_XML_DESCRIPTION_PATH:
+                # TODO: this ignores included sub-elements, e.g. links
+                description_texts.append(elem.text or "")
+            elif element_path == _CORPUS_XML_HEADER_PATH:
+                header_read = True
+                break
+
+            path.pop()
+            elem.clear()
+
+    # the document ended before the end of the teiHeader, e.g. because it is empty or truncated; closing the parser
+    # raises the ParseError
+    if header_read is False:
+        parser.close()
+
+    if len(description_texts) != 0:
+        metadata["description"] = "".join(description_texts)
+
+    return metadata
 
 
 def construct_request_url(
@@ -58,7 +228,8 @@ def api_get(
         corpusname: str = None,
         playname: str = None,
         method: str = None,
-        parse_json: bool = True):
+        parse_json: bool = True,
+        session: requests.Session = None):
     """Send GET request to a DraCor API
 
     Args:
@@ -67,21 +238,33 @@ def api_get(
         playname (str, optional): Identifier of play 'playname'.
         method (str, optional): API method, e.g. "tei", "cast", ...
         parse_json (bool, optiona): Parse the result as JSON. Defaults to True.
+        session (requests.Session, optional): Session to send the request with. Defaults to a session shared by the
+            module functions.
 
+    Raises:
+        ConnectionError: If the server does not return status code 200. The response is available as
+            attribute "response" of the exception.
     """
     request_url = construct_request_url(api_base_url=api_base_url,
                                         corpusname=corpusname,
                                         playname=playname,
                                         method=method)
 
-    logging.debug(f"Will send GET request to: {request_url}")
+    logging.debug("Will send GET request to: %s", request_url)
 
-    r = requests.get(request_url)
+    http = session if session is not None else _default_session()
+    r = http.get(request_url)
 
-    assert r.status_code == 200, "Request was not successful. Server returned status code: " + str(r.status_code)
+    if r.status_code != 200:
+        raise ConnectionError(f"Request was not successful. Server returned status code: {r.status_code}",
+                              response=r)
 
     if method == "tei":
         logging.debug("Requested TEI-XML, encoded in UTF-8.")
+        # The body is returned as it is if it is UTF-8 (or the server does not name the charset, which is the case
+        # for application/xml). Decoding it to text would let requests guess the encoding from the whole document.
+        if r.encoding is None or r.encoding.lower() in ("utf-8", "utf8"):
+            return r.content
         return r.text.encode("utf-8")
     elif parse_json is True:
         json_data = json.loads(r.text)
@@ -101,7 +284,8 @@ def api_post(
         username: str = "admin",
         password: str = "",
         headers: dict = None,
-        payload_format: str = "json"):
+        payload_format: str = "json",
+        session: requests.Session = None):
     """Send POST request to a DraCor API
 
     Args:
@@ -114,13 +298,15 @@ def api_post(
         password (str, optional): Password. Defaults to empty string ""
         headers (str, optional): Headers to include in the POST request
         payload_format (str, optional): Format of the payload. Defaults to "json".
+        session (requests.Session, optional): Session to send the request with. If username or password is None,
+            the authentication set on the session is used.
     """
     request_url = construct_request_url(api_base_url=api_base_url,
                                         corpusname=corpusname,
                                         playname=playname,
                                         method=method)
 
-    logging.debug(f"Will send POST request to: {request_url}")
+    logging.debug("Will send POST request to: %s", request_url)
 
     if username is not None and password is not None:
         logging.debug("Username and Password are set.")
@@ -129,37 +315,15 @@ def api_post(
         logging.debug("Username and Password are NOT set.")
         credentials = None
 
-    if data and headers and credentials:
-        logging.debug("Send POST request with data, headers and credentials.")
-        if payload_format == "json":
-            r = requests.post(request_url, json=data, headers=headers, auth=credentials)
-        else:
-            r = requests.post(request_url, data=data, headers=headers, auth=credentials)
-        logging.debug(f"Executed POST request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
-
-    elif data and credentials and not headers:
-        logging.debug("Send POST request with data and credentials, not headers.")
-        if payload_format == "json":
-            r = requests.post(request_url, json=data, auth=credentials)
-        else:
-            r = requests.post(request_url, data=data, auth=credentials)
-        logging.debug(f"Executed POST request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
-
-    elif data and headers and not credentials:
-        logging.debug("Send POST request with data and headers, no credentials.")
-        if payload_format == "json":
-            r = requests.post(request_url, json=data, headers=headers)
-        else:
-            r = requests.post(request_url, data=data, headers=headers)
-        logging.debug(f"Executed POST request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
+    http = session if session is not None else _default_session()
 
+    # requests ignores headers and credentials that are None
+    if data and payload_format == "json":
+        r = http.post(request_url, json=data, headers=headers, auth=credentials)
     else:
-        logging.debug("Send POST request without anything, only request url.")
-        r = requests.post(request_url)
-        return r.status_code
+        r = http.post(request_url, data=data, headers=headers, auth=credentials)
+    logging.debug("Executed POST request. Server returned status code: %s", r.status_code)
+    return r.status_code
 
 
 def api_put(data,
@@ -169,7 +333,8 @@ def api_put(data,
         method: str = None,
         username: str = "admin",
         password: str = "",
-        headers: dict = None):
+        headers: dict = None,
+        session: requests.Session = None):
     """Send PUT request to a DraCor API
 
         Args:
@@ -181,13 +346,15 @@ def api_put(data,
             username (str, optional): Username of a user with write access. Defaults to "admin"
             password (str, optional): Password. Defaults to empty string
             headers (dict, optional): HTTP headers to send with the request""
+            session (requests.Session, optional): Session to send the request with. If username or password is
+                None, the authentication set on the session is used.
         """
     request_url = construct_request_url(api_base_url=api_base_url,
                                         corpusname=corpusname,
                                         playname=playname,
                                         method=method)
 
-    logging.debug(f"Will send PUT request to: {request_url}")
+    logging.debug("Will send PUT request to: %s", request_url)
 
     if username is not None and password is not None:
         logging.debug("Credentials are provided.")
@@ -196,25 +363,12 @@ def api_put(data,
         logging.debug("Credentials are not provided.")
         credentials = None
 
-    if data and headers and credentials:
-        r = requests.put(request_url, data=data, headers=headers, auth=credentials)
-        logging.debug(f"Executed PUT request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
-
-    elif data and credentials and not headers:
-        r = requests.put(request_url, data=data, auth=credentials)
-        logging.debug(f"Executed PUT request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
+    http = session if session is not None else _default_session()
 
-    elif data and headers and not credentials:
-        r = requests.put(request_url, data=data, headers=headers)
-        logging.debug(f"Executed PUT request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
-
-    else:
-        r = requests.put(request_url)
-        logging.debug(f"Executed PUT request. Server returned status code: {str(r.status_code)}")
-        return r.status_code
+    # requests ignores headers and credentials that are None
+    r = http.put(request_url, data=data, headers=headers, auth=credentials)
+    logging.debug("Executed PUT request. Server returned status code: %s", r.status_code)
+    return r.status_code
 
 
 def api_delete(
@@ -224,7 +378,8 @@ def api_delete(
         method: str = None,
         username: str = "admin",
         password: str = "",
-        headers: dict = None):
+        headers: dict = None,
+        session: requests.Session = None):
     """Set DELETE request to a DraCor API
 
     Args:
@@ -235,13 +390,15 @@ def api_delete(
         username (str, optional): Username of a user with write access. Defaults to "admin"
         password (str, optional): Password. Defaults to empty string
         headers (dict, optional): HTTP headers to send with the request""
+        session (requests.Session, optional): Session to send the request with. If username or password is None,
+            the authentication set on the session is used.
     """
     request_url = construct_request_url(api_base_url=api_base_url,
                                         corpusname=corpusname,
                                         playname=playname,
                                         method=method)
 
-    logging.debug(f"Will send DELETE request to: {request_url}")
+    logging.debug("Will send DELETE request to: %s", request_url)
 
     if username is not None and password is not None:
         logging.debug("Credentials are provided.")
@@ -250,21 +407,12 @@ def api_delete(
         logging.debug("Credentials are not provided.")
         credentials = None
 
-    if credentials and headers:
-        r = requests.delete(request_url, headers=headers, auth=credentials)
-        logging.debug(f"Executed DELETE request including headers and credentials. "
-                      f"Server returned status code: {str(r.status_code)}")
-        return r.status_code
-    elif credentials and not headers:
-        r = requests.delete(request_url, auth=credentials)
-        logging.debug(f"Executed DELETE request including credentials, but no headers. "
-                      f"Server returned status code: {str(r.status_code)}")
-        return r.status_code
-    else:
-        r = requests.delete(request_url)
-        logging.debug(f"Executed DELETE request (no headers, no credentials). "
-                      f"Server returned status code: {str(r.status_code)}")
-        return r.status_code
+    http = session if session is not None else _default_session()
+
+    # requests ignores headers and credentials that are None
+    r = http.delete(request_url, headers=headers, auth=credentials)
+    logging.debug("Executed DELETE request. Server returned status code: %s", r.status_code)
+    return r.status_code
 
 
 """
@@ -289,6 +437,37 @@ class StableDraCor:
         staging="https://staging.dracor.org/api/",
     )
 
+    # Number of connections per host that the HTTP sessions keep alive
+    __http_pool_size = 16
+
+    # Seconds for which the data requested from the local API to build the manifest is re-used
+    __manifest_cache_ttl = 30
+
+    # Seconds for which the names of the corpora requested from the local API are re-used
+    __corpus_names_cache_ttl = 5
+
+    # Seconds for which the latest commit of a GitHub repository is re-used
+    __latest_commit_cache_ttl = 60
+
+    # Prefixes of image names that explicitly reference the Docker Hub registry
+    __docker_hub_prefixes = ("docker.io/", "index.docker.io/", "registry-1.docker.io/")
+
+    # Default compose file once it has been fetched; shared by all instances for the lifetime of the process
+    __default_docker_compose = None
+
+    # Fields of a source of a corpus that are stored as labels of a docker image: (field, suffix of the label)
+    __source_label_fields = [
+        ("corpusname", "corpusname"),
+        ("type", "type"),
+        ("url", "url"),
+        ("timestamp", "timestamp"),
+        ("commit", "commit"),
+        ("num_of_plays", "num-of-plays"),
+    ]
+
+    # Fields of a source listing plays that are excluded/included; they contain "type" and a list of "ids"
+    __source_label_id_list_fields = ["exclude", "include"]
+
     def __init__(self,
                  api_base_url: str = None,
                  username: str = None,
@@ -312,53 +491,64 @@ class StableDraCor:
 
         # Set a uuid
         self.__id = uuid.uuid4()
-        logging.debug(f"Generated ID: {self.__id}.")
+        logging.debug("Generated ID: %s.", self.__id)
 
         # Create a system from a provided manifest
         if manifest is not None:
             logging.warning("Creating a system from a manifest is not implemented yet.")
 
         if name is not None:
-            logging.debug(f"Set name to: {name}")
+            logging.debug("Set name to: %s", name)
             self.__name = name
         else:
             self.__name = None
 
         if description is not None:
-            logging.debug(f"Set description to: {name}")
+            logging.debug("Set description to: %s", description)
             self.__description = description
         else:
             self.__description = None
 
         if api_base_url is not None:
-            logging.debug(f"Update api_base_url with: {api_base_url}")
+            logging.debug("Update api_base_url with: %s", api_base_url)
             self.__api_base_url = api_base_url
         else:
             self.__api_base_url = "http://localhost:8088/api/"
 
         if username is not None:
-            logging.debug(f"Update username with: {api_base_url}")
+            logging.debug("Update username with: %s", username)
             self.__username = username
         else:
             logging.debug("Using default username 'admin'.")
             self.__username = "admin"
 
         if password is not None:
-            logging.debug(f"Update password with: {api_base_url}")
+            logging.debug("Update password.")
             self.__password = password
         else:
             logging.debug("Using default password: ''.")
             self.__password = ""
 
-        logging.info(f"Initialized new StableDraCor instance: '{self.__name}' (ID: {self.__id}).")
+        # Session for requests to the local DraCor API. Credentials are set once and sent with every request.
+        self.__session = self.__create_http_session()
+        self.__session.auth = HTTPBasicAuth(self.__username, self.__password)
+
+        logging.info("Initialized new StableDraCor instance: '%s' (ID: %s).", self.__name, self.__id)
 
         if self.__test_api_connection() is True:
-            logging.info(f"Local DraCor API is available at {self.__api_base_url}.")
+            logging.info("Local DraCor API is available at %s.", self.__api_base_url)
         else:
-            logging.warning(f"Local DraCor API is not available at {self.__api_base_url}.")
+            logging.warning("Local DraCor API is not available at %s.", self.__api_base_url)
+
+        # Session for requests to the GitHub API. The access token is set once as header of the session.
+        self.__github_session = self.__create_http_session(retry=True)
+
+        # Session for requests to other servers, e.g. to download compose files. It sends no credentials.
+        self.__external_session = self.__create_http_session(retry=True)
 
         if github_access_token is not None:
             self.__github_access_token = github_access_token
+            self.__github_session.headers["Authorization"] = f"Bearer {self.__github_access_token}"
         else:
             self.__github_access_token = None
             logging.warning("Personal GitHub Access Token is not supplied. Requests to the GitHub API might be affected"
@@ -388,9 +578,60 @@ class StableDraCor:
         # docker-compose file
         self.__docker_compose_file = None
 
+        # Name of the docker compose project (-p) the services were started with
+        self.__docker_compose_project = None
+
         # Metadata on loaded corpora
         self.__corpora = {}
 
+        # Data requested from the local API to build the manifest: (time of the request, (api info, corpus metrics))
+        self.__manifest_cache = None
+
+        # Names of the corpora in the local API: (time of the request, set of names)
+        self.__corpus_names_cache = None
+
+        # Latest commits of GitHub repositories: {(owner, repository, branch): (time of the request, (sha, tree sha))}
+        self.__latest_commits = {}
+
+        # Successful responses of the GitHub API, e.g. commits, trees and blobs: {url: (ETag, body)}
+        self.__github_responses = {}
+
+        # Metadata (including the list of plays) of corpora of other DraCor APIs, keyed by (API URL, corpusname)
+        self.__source_corpora = {}
+
+    def __create_http_session(self, retry: bool = False) -> requests.Session:
+        """Helper function to create a session with a pool of keep-alive connections.
+
+        The pool is sized so that requests that are sent concurrently each re-use an open connection
+        instead of opening (and discarding) additional connections.
+
+        Args:
+            retry (bool, optional): Retry requests that fail with a connection error or a 502, 503, 504 response
+                a few times with a short backoff. After the last attempt the response is returned as is.
+                Defaults to False, the local API is polled with its own retry logic (__wait_for_api_connection).
+        """
+        session = requests.Session()
+
+        max_retries = 0
+        if retry is True:
+            max_retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+
+        adapter = HTTPAdapter(pool_connections=self.__http_pool_size,
+                              pool_maxsize=self.__http_pool_size,
+                              max_retries=max_retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def __get_cache_directory(self) -> str:
+        """Helper function to get (and create) the directory the client caches downloaded files in.
+        Uses $XDG_CACHE_HOME/stabledracor, which defaults to ~/.cache/stabledracor.
+        """
+        cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        cache_directory = os.path.join(cache_home, "stabledracor")
+        os.makedirs(cache_directory, exist_ok=True)
+        return cache_directory
+
     def __prepare_system_metadata(self) -> dict:
         """Helper funtion to prepare metadata on running system"""
 
@@ -409,8 +650,23 @@ class StableDraCor:
 
         return metadata
 
-    def get_manifest(self):
-        """Get manifest of the running system"""
+    def __invalidate_api_cache(self):
+        """Helper function to discard the data cached from the local API (data to build the manifest, names of the
+        corpora). Must be called whenever the local API or the data in it changes."""
+        self.__manifest_cache = None
+        self.__corpus_names_cache = None
+
+    def get_manifest(self, refresh: bool = False):
+        """Get manifest of the running system
+
+        The API info and the metrics of the corpora are requested from the local API and cached for a short time,
+        e.g. when creating images of several services in a row. Changing data in the local API, running or stopping
+        services and registering a service invalidates the cache.
+
+        Args:
+            refresh (bool, optional): Request the data from the local API even if cached data is available.
+                Defaults to False.
+        """
 
         manifest = dict(
             version="v1",
@@ -419,8 +675,26 @@ class StableDraCor:
             corpora=self.__corpora
             )
 
+        if refresh is False and self.__manifest_cache is not None \
+                and time.monotonic() - self.__manifest_cache[0] < self.__manifest_cache_ttl:
+            logging.debug("Using cached API info and metrics of corpora.")
+            api_info, corpora_metrics = self.__manifest_cache[1]
+        else:
+            # The API info and the metrics of the corpora are independent requests; send them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                api_info_future = executor.submit(self.get_api_info)
+                corpora_metrics_future = executor.submit(self.__get_corpora_metrics_for_manifest)
+
+            api_info = api_info_future.result()
+
+            try:
+                corpora_metrics = corpora_metrics_future.result()
+                self.__manifest_cache = (time.monotonic(), (api_info, corpora_metrics))
+            except:
+                logging.debug("Retrieving metrics of corpora failed.")
+                corpora_metrics = dict()
+
         # Add additional information to the api service
-        api_info = self.get_api_info()
         if "version" in api_info:
             if "api" in self.__services:
                 manifest["services"]["api"]["version"] = api_info["version"]
@@ -430,12 +704,6 @@ class StableDraCor:
                 manifest["services"]["api"]["existdb"] = api_info["existdb"]
 
         # add number of plays to corpora
-        try:
-            corpora_metrics = self.__get_corpora_metrics_for_manifest()
-        except:
-            logging.debug("Retrieving metrics of corpora failed.")
-            corpora_metrics = dict()
-
         #logging.debug(corpora_metrics)
 
         for corpus_metrics_key in corpora_metrics.keys():
@@ -450,35 +718,63 @@ class StableDraCor:
         """Send GET request to running local instance. Uses the function api_get, but overrides api_base_url
         with the URL of the local instance"""
         try:
-            result = api_get(api_base_url=self.__api_base_url, **kwargs)
+            result = api_get(api_base_url=self.__api_base_url, session=self.__session, **kwargs)
             return result
-        except AssertionError as err:
+        except ConnectionError as err:
             # This is probably because the eXist-DB is not ready; it returns status code 502
-            logging.debug(f"Caught exception: {str(err)}.")
-            raise ConnectionError("Can not establish connection.")
+            logging.debug("Caught exception: %s.", err)
+            raise
+
+    def __wait_for_api_connection(self,
+                                  max_retries: int = 15,
+                                  max_retry_after: int = 30,
+                                  initial_delay: float = 0.2,
+                                  max_delay: float = 5) -> bool:
+        """Helper function to periodically check connection to DraCor API
+
+        The /info endpoint is probed with a HEAD request (falls back to GET if HEAD is not supported) over the
+        session of the instance. The delay between the attempts grows exponentially from initial_delay to max_delay,
+        so that an API that is already up is detected almost immediately. With the defaults it is waited for about
+        50 seconds in total before giving up.
+        If the server sends a "Retry-After" header (in seconds), e.g. with a 503 response while eXist-DB is starting,
+        the delay requested by the server is used (capped at max_retry_after).
+        """
+        request_url = construct_request_url(api_base_url=self.__api_base_url, method="info")
 
-    def __wait_for_api_connection(self, max_retries: int = 10) -> bool:
-        """Helper function to periodically check connection to DraCor API"""
-        connection = False
-        attempts = max_retries
+        for attempt in range(max_retries):
+            retry_after = None
 
-        while connection is False:
             try:
-                self.get_api_info()
-                connection = True
-            except ConnectionError:
-                attempts = attempts - 1
-                logging.debug(f"Connection not successful. Will retry in 5 seconds. {str(attempts)} attempts left.")
-                time.sleep(5)
+                r = self.__session.head(request_url, timeout=2)
+                if r.status_code in (405, 501):
+                    # HEAD is not supported by the server
+                    r = self.__session.get(request_url, timeout=2)
+
+                if r.status_code == 200:
+                    return True
+
+                retry_after = r.headers.get("Retry-After")
+            except (ConnectionError, requests.Timeout):
+                pass
+
+            attempts = max_retries - attempt - 1
             if attempts <= 0:
-                logging.debug(f"Can not connect to API after {max_retries}. Giving up.")
-                return False
+                break
 
-        return True
+            if retry_after is not None and retry_after.isdigit():
+                delay = min(max_retry_after, int(retry_after))
+            else:
+                delay = min(max_delay, initial_delay * 2 ** attempt)
+
+            logging.debug("Connection not successful. Will retry in %s seconds. %s attempts left.", delay, attempts)
+            time.sleep(delay)
+
+        logging.debug("Can not connect to API after %s attempts. Giving up.", max_retries)
+        return False
 
     def __api_post(self, data, **kwargs):
         """Send POST request to running local instance. Uses the function api_post, but overrides api_base_url
-        with the URL of the local instance
+        with the URL of the local instance. Credentials are provided by the session of the instance.
 
         Args:
             data: Payload to include in body
@@ -486,24 +782,30 @@ class StableDraCor:
         """
 
         logging.debug(kwargs)
-        return api_post(data, api_base_url=self.__api_base_url, **kwargs)
+        self.__invalidate_api_cache()
+        return api_post(data, api_base_url=self.__api_base_url, session=self.__session,
+                        username=None, password=None, **kwargs)
 
     def __api_put(self, data, **kwargs):
         """Send PUT request to running local instance. Uses the function api_put, but overrides api_base_url
-        with the URL of the local instance
+        with the URL of the local instance. Credentials are provided by the session of the instance.
 
         Args:
             data: Payload to include in body
         """
         logging.debug(kwargs)
-        return api_put(data, api_base_url=self.__api_base_url, **kwargs)
+        self.__invalidate_api_cache()
+        return api_put(data, api_base_url=self.__api_base_url, session=self.__session,
+                       username=None, password=None, **kwargs)
 
     def __api_delete(self, **kwargs):
         """Send DELETE request to running local instance. Uses the function api_delete, but overrides api_base_url
-        with the URL of the local instance
+        with the URL of the local instance. Credentials are provided by the session of the instance.
         """
         logging.debug(kwargs)
-        return api_delete(api_base_url=self.__api_base_url, **kwargs)
+        self.__invalidate_api_cache()
+        return api_delete(api_base_url=self.__api_base_url, session=self.__session,
+                          username=None, password=None, **kwargs)
 
     def __test_api_connection(self):
         """Test if local DraCor API is available."""
@@ -525,46 +827,68 @@ class StableDraCor:
         Args:
             api_call (str, optional): endpoint and parameters that should be sent to the GitHub API.
             url (str, optional): Full URL to GET data from GitHub API. If provided, api_call will be ignored.
-            headers (dict, optional): Headers to send with the GET request. If provided on class instance level,
-                will include the "Authorization" field with value of the personal access token and thus send authorized
-                requests.
+            headers (dict, optional): Additional headers to send with the GET request. If a personal access token is
+                provided on class instance level, the session adds the "Authorization" header and thus sends
+                authorized requests.
             parse_json (bool, optional): Parse the response as JSON. Defaults to True.
 
+        Successful responses are kept for the lifetime of the instance. Responses of git trees and blobs requested by
+        a full SHA do not change and are returned again without a request. Other resources, e.g. trees requested by a
+        branch name, are re-validated with a conditional request if the kept response carries an ETag; the kept
+        response is re-used if GitHub answers with 304 Not Modified.
         """
         # Base-URL of the GitHub API
         github_api_base_url = "https://api.github.com/"
 
-        if self.__github_access_token is not None:
-            if headers is not None:
-                headers["Authorization"] = f"Bearer {self.__github_access_token}"
-            else:
-                headers = dict(
-                    Authorization=f"Bearer {self.__github_access_token}"
-                )
-
         if api_call is not None and url is None:
             request_url = f"{github_api_base_url}{api_call}"
-            logging.debug(f"Send GET request to GitHub: {request_url}")
+            logging.debug("Send GET request to GitHub: %s", request_url)
         elif url is not None:
             request_url = url
-            logging.debug(f"Provided full URL to send GET request to GitHub: {request_url}.")
+            logging.debug("Provided full URL to send GET request to GitHub: %s.", request_url)
         else:
             request_url = github_api_base_url
-            logging.debug(f"No specialized API call (api_call) provided. Will send GET request to GitHub API "
-                          f" base url.")
+            logging.debug("No specialized API call (api_call) provided. Will send GET request to GitHub API "
+                          " base url.")
+
+        cached_response = self.__github_responses.get(request_url)
+        if cached_response is not None and _GITHUB_OBJECT_BY_SHA.search(request_url) is not None:
+            logging.debug("Using cached response of %s.", request_url)
+            return json.loads(cached_response[1]) if parse_json is True else cached_response[1]
+
+        # Trees and blobs requested by their SHA do not change; they are also kept on disk for later sessions. Only
+        # responses to unauthorized requests are written to disk (see below), so the files hold public data only.
+        cache_file = self.__get_github_cache_file(request_url)
+        if cache_file is not None and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    text = f.read()
+                data = json.loads(text)
+                logging.debug("Using response of %s cached in %s.", request_url, cache_file)
+                self.__github_responses[request_url] = (None, text)
+                return data if parse_json is True else text
+            except (OSError, json.JSONDecodeError) as err:
+                # e.g. a file that has been cut short; it is replaced by the response of a new request
+                logging.debug("Could not use cached response in %s: %s", cache_file, err)
+                try:
+                    os.remove(cache_file)
+                except OSError:
+                    pass
 
-        if headers is not None:
-            r = requests.get(url=request_url, headers=headers)
-        else:
-            r = requests.get(url=request_url)
+        # Re-validate a response that has been received before. If it has not changed, GitHub answers with
+        # 304 Not Modified, which does not count against the rate limit.
+        if cached_response is not None and cached_response[0] is not None:
+            headers = dict(headers or {}, **{"If-None-Match": cached_response[0]})
+
+        r = self.__github_session.get(url=request_url, headers=headers)
 
         # logging.debug(r.headers)
         if "X-RateLimit-Remaining" in r.headers:
-            if 1 < int(r.headers["X-RateLimit-Remaining"]) < 5:
-                logging.warning(f"Approaching maximum API calls (rate limit). Remaining: "
-                                f" {r.headers['X-RateLimit-Remaining']}")
-            elif int(r.headers["X-RateLimit-Remaining"] == 1):
-                logging.warning(f"Reached rate limit of {r.headers['X-RateLimit-Limit']}.")
+            rate_limit_remaining = int(r.headers["X-RateLimit-Remaining"])
+            if 1 < rate_limit_remaining < 5:
+                logging.warning("Approaching maximum API calls (rate limit). Remaining: %s", rate_limit_remaining)
+            elif rate_limit_remaining <= 1:
+                logging.warning("Reached rate limit of %s.", r.headers.get("X-RateLimit-Limit"))
                 if self.__github_access_token is None:
                     logging.warning("Requests to GitHub API are probably unauthorized. Provide a personal "
                                     "access token to get a higher rate limit. "
@@ -572,24 +896,77 @@ class StableDraCor:
                                     "keeping-your-account-and-data-secure/managing-your-personal-access-tokens"
                                     "#creating-a-personal-access-token-classic")
 
-        if r.status_code == 200:
-            logging.debug(f"GET request to GitHub API was successful.")
+        if r.status_code == 304 and cached_response is not None:
+            logging.debug("Resource at %s has not been modified. Using cached response.", request_url)
+            text = cached_response[1]
+        elif r.status_code == 200:
+            logging.debug("GET request to GitHub API was successful.")
+            text = r.text
+            self.__github_responses[request_url] = (r.headers.get("ETag"), text)
+
+            # A response to an authorized request can contain data of a private repository; it is not written to
+            # the cache directory, which is shared by all instances regardless of their token
+            if cache_file is not None and self.__github_access_token is None:
+                # The response is written to a temporary file first and then moved into place, so that the cache
+                # file is either complete or does not exist
+                temporary_cache_file = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(temporary_cache_file, "w", encoding="utf-8") as f:
+                        f.write(text)
+                    os.replace(temporary_cache_file, cache_file)
+                except OSError as err:
+                    logging.debug("Could not cache response of %s: %s", request_url, err)
+                    try:
+                        os.remove(temporary_cache_file)
+                    except OSError:
+                        pass
+        else:
+            text = None
+
+        if text is not None:
             if parse_json is True:
-                data = json.loads(r.text)
+                data = json.loads(text)
                 return data
             else:
-                return r.text
+                return text
         # TODO implement the other status codes
         else:
-            logging.debug(f"GET request was not successful. Server returned status code: {str(r.status_code)}.")
+            logging.debug("GET request was not successful. Server returned status code: %s.", r.status_code)
             logging.debug(r.text)
 
+    def __get_github_cache_file(self, request_url: str) -> str:
+        """Helper function to get the path of the file a response of the GitHub API is cached in on disk.
+        Only git trees and blobs that are requested by a full SHA (of the object or of a commit) are cached; their
+        contents never change. The files are kept per repository.
+
+        Args:
+            request_url (str): URL of the request to the GitHub API
+
+        Returns:
+            str: Path of the cache file; None if the response must not be cached.
+        """
+        match = _GITHUB_OBJECT_BY_SHA.search(request_url)
+        if match is None:
+            return None
+
+        repository_owner, repository_name, object_type, sha, recursive = match.groups()
+
+        # The cache is optional; if the cache directory can not be used, the responses are not cached on disk
+        try:
+            # names of users and repositories on GitHub are not case-sensitive
+            cache_directory = os.path.join(self.__get_cache_directory(), "github", repository_owner.lower(),
+                                           repository_name.lower())
+            os.makedirs(cache_directory, exist_ok=True)
+        except OSError as err:
+            logging.debug("Can not use the cache directory: %s", err)
+            return None
+
+        filename = f"{object_type}-{sha}-recursive.json" if recursive else f"{object_type}-{sha}.json"
+        return os.path.join(cache_directory, filename)
+
     def __check_docker_installed(self):
         """Helper Function to test if Docker is installed and can execute commands"""
-        run_check = subprocess.run(["docker", "--version"], capture_output=True)
-        docker_version_string = run_check.stdout.decode("utf-8")
-
-        if "Docker version" in docker_version_string:
+        if _docker_available() is True:
             logging.info(f"Docker is available.")
             return True
         else:
@@ -608,17 +985,53 @@ class StableDraCor:
 
         return operation_system
 
-    def list_docker_images(self):
-        """List Docker images available"""
-        # docker images repo1 --format "{{json . }}"
-        operation = subprocess.run(["docker", "images", "--format", '{{json . }}'], capture_output=True)
-        items = operation.stdout.decode("utf-8").split("\n")
-        images = []
-        for item in items:
-            if item != "":
-                image = json.loads(item)
-                images.append(image)
-        return images
+    def __iter_docker_json_output(self, command: list):
+        """Helper function to run a docker command that prints one JSON object per line (--format '{{json . }}').
+        The output is parsed line by line while it is read, it is not buffered as a whole. Stopping the iteration
+        early does not parse the remaining lines.
+
+        Args:
+            command (list): Docker command, e.g. ["docker", "images", "--format", '{{json . }}']
+
+        Yields:
+            dict: Parsed line of the output
+        """
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as operation:
+            # Every line is a JSON object. json.loads parses the UTF-8 encoded bytes, they are not decoded first.
+            for line in operation.stdout:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def iter_docker_images(self, filters: list = None):
+        """Iterate over Docker images available
+
+        Args:
+            filters (list, optional): Filters passed to "docker images --filter", e.g. ["reference=dracor/*"].
+
+        Yields:
+            dict: Image
+        """
+        command = ["docker", "images"]
+
+        if filters is not None:
+            for docker_filter in filters:
+                command.extend(["--filter", docker_filter])
+
+        command.extend(["--format", '{{json . }}'])
+
+        yield from self.__iter_docker_json_output(command)
+
+    def list_docker_images(self, filters: list = None) -> list:
+        """List Docker images available
+
+        Args:
+            filters (list, optional): Filters passed to "docker images --filter", e.g. ["reference=dracor/*"].
+
+        Returns:
+            list: Images
+        """
+        return list(self.iter_docker_images(filters=filters))
 
     def get_labels_from_docker_image(self, id: str) -> dict:
         """Extract labels from a docker image identified by its image ID
@@ -736,35 +1149,97 @@ class StableDraCor:
             image_labels = self.get_labels_from_docker_image(id=image)
             return self.__docker_labels_to_manifest(image_labels)
 
+    def iter_docker_containers(self,
+                               only_running: bool = False,
+                               filters: list = None):
+        """Iterate over Docker containers. The output of "docker ps" is parsed line by line while it is read,
+        it is not buffered as a whole. Stopping the iteration early does not parse the remaining containers.
+
+        Args:
+            only_running (bool): Filter on running containers. Defaults to False
+            filters (list, optional): Filters passed to "docker ps --filter", e.g. ["id=1a2b3c"]. Docker only
+                returns the matching containers.
+
+        Yields:
+            dict: Container
+        """
+        command = ["docker", "ps"]
+
+        if only_running is False:
+            command.append("-a")
+
+        if filters is not None:
+            for docker_filter in filters:
+                command.extend(["--filter", docker_filter])
+
+        command.extend(["--format", '{{json . }}'])
+
+        yield from self.__iter_docker_json_output(command)
+
     def list_docker_containers(self,
-                               only_running: bool = False) -> list:
+                               only_running: bool = False,
+                               filters: list = None) -> list:
         """
 
         Args:
             only_running (bool): Filter on running containers. Defaults to False
+            filters (list, optional): Filters passed to "docker ps --filter", e.g. ["id=1a2b3c"]. Docker only
+                returns the matching containers.
 
         Returns:
             list: Containers
         """
-        if only_running is True:
-            operation = subprocess.run(["docker", "ps", "--format", '{{json . }}'], capture_output=True)
-        else:
-            operation = subprocess.run(["docker", "ps", "-a", "--format", '{{json . }}'], capture_output=True)
+        return list(self.iter_docker_containers(only_running=only_running, filters=filters))
+
+    def __index_docker_containers_by_image(self, containers: list) -> dict:
+        """Helper function to index containers by the image they are derived from. The key is the name of the image
+        without tag or digest, e.g. "dracor/dracor-api" for a container running "dracor/dracor-api:v0.90.1-local".
+        Looking up the index is an exact match of the whole name: "dracor/dracor-api" does not match
+        "dracor/dracor-api-fork" or "myregistry.com/dracor/dracor-api". Images referenced with the explicit Docker Hub
+        registry, e.g. "docker.io/dracor/dracor-api", are the same images and are indexed without the registry.
 
-        items = operation.stdout.decode("utf-8").split("\n")
+        Args:
+            containers (list): Containers as returned by list_docker_containers
+
+        Returns:
+            dict: Lists of containers keyed by the name of the image
+        """
+        containers_by_image = {}
+
+        for container in containers:
+            image_name = container["Image"].split("@")[0]
+            # a colon after the last slash separates the tag; a colon before it belongs to a registry port
+            if ":" in image_name.rsplit("/", 1)[-1]:
+                image_name = image_name.rsplit(":", 1)[0]
+            for docker_hub_prefix in self.__docker_hub_prefixes:
+                if image_name.startswith(docker_hub_prefix):
+                    image_name = image_name[len(docker_hub_prefix):]
+                    break
+            containers_by_image.setdefault(image_name, []).append(container)
+
+        return containers_by_image
+
+    def __get_docker_container_by_id(self, container_id: str) -> dict:
+        """Helper function to get a single container (running or not) identified by its ID. Docker filters the
+        containers, so only the requested container is returned and parsed.
 
-        containers = []
-        for item in items:
-            if item != "":
-                container = json.loads(item)
-                containers.append(container)
+        Args:
+            container_id (str): ID of the container
+
+        Returns:
+            dict: Container data as returned by "docker ps" or None if there is no such container
+        """
+        container = next(self.iter_docker_containers(filters=[f"id={container_id}"]), None)
 
-        return containers
+        if container is None:
+            logging.warning("There is no Docker container with ID %s.", container_id)
+
+        return container
 
     def __detect_single_docker_service(self,
                                        name: str,
                                        expected_image: str,
-                                       containers: list = None
+                                       containers_by_image: dict = None
                                        ):
         """Detect a single running Docker service based on the image used. We assume, that
         the containers are build with the standard images, e.g. dracor/dracor-api, ... and that we can filter
@@ -774,14 +1249,16 @@ class StableDraCor:
             name (str): Common name of the service, e.g. "api", "frontend", "tiplestore", "metrics"
             expected_image (str): Filter the containers by image. We look for the standard images, e.g.
                 "dracor/dracor-api"
-            containers (list, optional): A list of containers that will be filtered based on the expected_image
+            containers_by_image (dict, optional): Containers indexed by image name
+                (see __index_docker_containers_by_image) that will be looked up by the expected_image
         """
 
-        if containers is None:
+        if containers_by_image is None:
             # if not set, get the running containers
             containers = self.list_docker_containers(only_running=True)
+            containers_by_image = self.__index_docker_containers_by_image(containers)
 
-        container = list(filter(lambda item: f"{expected_image}" in item["Image"], containers))
+        container = containers_by_image.get(expected_image, [])
 
         if len(container) == 0:
             logging.warning(f"Could not detect a running Docker container derived from a {expected_image} image.")
@@ -807,19 +1284,19 @@ class StableDraCor:
                             f"image. Can not automatically detect if it is the database that shall be used. "
                             f"Set the container manually!")
 
-    def __detect_docker_services(self):
+    def __detect_docker_services(self, project: str = None):
         """Helper function to detect running services.
 
         can do this based on the image or the port?
          e.g. 'Ports': '0.0.0.0:8080->8080/tcp', (Port would probably be the better option for API/frontend)
-        Ideally only one container would be running. This would be the container to work with."""
+        Ideally only one container would be running. This would be the container to work with.
+        Services that are already registered with a container are not detected again. If all of them are registered,
+        the running containers are not listed at all.
 
-        running_containers = self.list_docker_containers(only_running=True)
-        if len(running_containers) == 0:
-            logging.debug("No running Docker containers found.")
-        else:
-            logging.debug(f"Detected {len(running_containers)} running Docker containers.")
-            # logging.debug(running_containers)
+        Args:
+            project (str, optional): Name of a docker compose project. If set, only the containers of this project
+                are considered, docker filters them by the label com.docker.compose.project.
+        """
 
         expected_service_images = dict(
             api="dracor/dracor-api",
@@ -828,16 +1305,38 @@ class StableDraCor:
             triplestore="dracor/dracor-fuseki"
         )
 
-        for service_name in expected_service_images.keys():
+        services_to_detect = [service_name for service_name in expected_service_images.keys()
+                              if self.__services.get(service_name) is None
+                              or "container" not in self.__services[service_name]]
+
+        if len(services_to_detect) == 0:
+            logging.debug("All services are already registered. Skipping detection of running containers.")
+            return
+
+        filters = None
+        if project is not None:
+            filters = [f"label=com.docker.compose.project={project}"]
+
+        running_containers = self.list_docker_containers(only_running=True, filters=filters)
+        if len(running_containers) == 0:
+            logging.debug("No running Docker containers found.")
+        else:
+            logging.debug("Detected %s running Docker containers.", len(running_containers))
+            # logging.debug(running_containers)
+
+        # Index the containers once; every service is then a single lookup
+        containers_by_image = self.__index_docker_containers_by_image(running_containers)
+
+        for service_name in services_to_detect:
             self.__detect_single_docker_service(name=service_name,
                                                 expected_image=expected_service_images[service_name],
-                                                containers=running_containers)
+                                                containers_by_image=containers_by_image)
 
         # API/eXist could also be derived from dracor/stable-dracor:{tag} this should be also checked
         if self.__services["api"] is None:
             self.__detect_single_docker_service(name="api",
                                                 expected_image="dracor/stable-dracor",
-                                                containers=running_containers)
+                                                containers_by_image=containers_by_image)
 
     def __run_services_with_docker_compose(self,
                                            compose_file: str = None,
@@ -860,7 +1359,7 @@ class StableDraCor:
         if compose_file is None:
 
             if url is not None:
-                r = requests.get(url=url)
+                r = self.__external_session.get(url=url)
                 if r.status_code == 200:
                     logging.debug(f"Downloaded file from {url}. Will try stating services based on this file.")
                     compose_file_raw = r.text
@@ -874,18 +1373,19 @@ class StableDraCor:
             else:
                 logging.warning(f"No compose file specified. Can not run services.")
 
-            compose_file_bytes = bytes(compose_file_raw, "utf-8")
-
-            operation = subprocess.run(["docker",
-                                        "compose",
-                                        "-p",
-                                        f"{stack_name}",
-                                        "-f",
-                                        "-",
-                                        "up",
-                                        "-d"], input=compose_file_bytes)
+            # The compose file is written to stdin of docker compose ("-f -")
+            with subprocess.Popen(["docker",
+                                   "compose",
+                                   "-p",
+                                   f"{stack_name}",
+                                   "-f",
+                                   "-",
+                                   "up",
+                                   "-d"], stdin=subprocess.PIPE) as operation:
+                operation.communicate(input=compose_file_raw.encode("utf-8"))
 
             logging.info(f"Started with downloaded docker compose file.")
+            self.__docker_compose_project = stack_name
 
         elif compose_file is not None:
 
@@ -899,6 +1399,7 @@ class StableDraCor:
                                         "-d"])
             logging.debug(f"Started with docker compose file {compose_file}")
             self.__docker_compose_file = compose_file
+            self.__docker_compose_project = stack_name
 
             return True
 
@@ -908,16 +1409,65 @@ class StableDraCor:
     def __get_default_docker_compose(self):
         """Helper function to get a docker compose file to run an empty stack with. This is a fallback
         to make running a local instance easy.
+
+        The file is cached on disk together with its ETag. If the file has not changed, the server answers the
+        conditional request with 304 and the cached file is used. Once retrieved, the file is kept in memory and not
+        requested again by this process.
         TODO: rework this method
         """
+        if StableDraCor.__default_docker_compose is not None:
+            logging.debug("Using default compose file (configuration) retrieved before.")
+            return StableDraCor.__default_docker_compose
+
         # The default URL of the compose file is hardcoded. It might be necessary to use different configurations
         # depending on the operation-system.
         url = "https://raw.githubusercontent.com/dracor-org/stabledracor/master/configurations/compose.fullstack.empty.yml"
 
-        r = requests.get(url=url)
+        # The cache is optional; if the cache directory can not be used, the file is requested without it
+        try:
+            cached_compose_file = os.path.join(self.__get_cache_directory(), "compose.fullstack.empty.yml")
+        except OSError as err:
+            logging.debug("Can not use the cache directory: %s", err)
+            cached_compose_file = None
+
+        headers = {}
+        if cached_compose_file is not None:
+            cached_etag_file = f"{cached_compose_file}.etag"
+            if os.path.exists(cached_compose_file) and os.path.exists(cached_etag_file):
+                try:
+                    with open(cached_etag_file, "r") as f:
+                        headers["If-None-Match"] = f.read().strip()
+                except OSError as err:
+                    logging.debug("Could not read ETag of cached default compose file: %s", err)
+
+        r = self.__external_session.get(url=url, headers=headers)
+        if r.status_code == 304:
+            try:
+                with open(cached_compose_file, "r") as f:
+                    compose_file = f.read()
+                logging.info("Default compose file (configuration) at %s has not changed. Using cached file %s.",
+                             url, cached_compose_file)
+                StableDraCor.__default_docker_compose = compose_file
+                return compose_file
+            except OSError as err:
+                logging.debug("Could not read cached default compose file: %s. Will request it again.", err)
+                r = self.__external_session.get(url=url)
+
         if r.status_code == 200:
             compose_file = r.text
             logging.info(f"Fetched default compose file (configuration) from {url}.")
+
+            if cached_compose_file is not None and "ETag" in r.headers:
+                try:
+                    with open(cached_compose_file, "w") as f:
+                        f.write(compose_file)
+                    with open(cached_etag_file, "w") as f:
+                        f.write(r.headers["ETag"])
+                    logging.debug("Cached default compose file as %s.", cached_compose_file)
+                except OSError as err:
+                    logging.debug("Could not cache default compose file: %s", err)
+
+            StableDraCor.__default_docker_compose = compose_file
             return compose_file
         else:
             logging.warning(f"Could not retrieve compose file. Server returned status code {str(r.status_code)}.")
@@ -935,6 +1485,8 @@ class StableDraCor:
         Returns:
             bool: True if successful.
         """
+        self.__invalidate_api_cache()
+
         if compose_file is None and url is None:
             self.__run_services_with_docker_compose(fetch_default_compose=True)
         elif url is not None:
@@ -942,10 +1494,11 @@ class StableDraCor:
         elif compose_file is not None:
             self.__run_services_with_docker_compose(compose_file=compose_file)
 
-        # Try to detect running docker services
-        self.__detect_docker_services()
+        # Try to detect the services of the started stack. Only the containers of the compose project are listed,
+        # containers of other stacks running on the same host are not taken into account
+        self.__detect_docker_services(project=self.__docker_compose_project)
 
-        # this will try to get the API info, try 10 times, wait 5 seconds between the attempts; if
+        # this will probe the API info with increasing delays between the attempts; if
         # a connection can be established it will return true
         logging.info("Trying to connect to the local DraCor API. This can take some time ...")
         api_connection_status = self.__wait_for_api_connection()
@@ -965,18 +1518,34 @@ class StableDraCor:
         """Helper function to stop the whole docker stack
         docker compose -f {compose_file} stop does not work – maybe because of the containers
         running in detached mode, therefore we stop all containers in self.__services..
+        docker stop accepts several containers and stops them concurrently, so the grace period is only waited for
+        once and not once per container.
         TODO: this should maybe return a status
         """
-        for key in self.__services.keys():
-            container = self.__services[key]["container"]
-            self.__stop_docker_container_by_id(container)
+        containers = [service["container"] for service in self.__services.values()
+                      if service is not None and "container" in service]
+
+        if len(containers) == 0:
+            logging.warning("Can not stop stack. No containers are registered as services.")
+            return
+
+        stop_operation = subprocess.run(["docker", "stop", *containers], capture_output=True, text=True)
+
+        # docker stop prints each container it has stopped
+        stopped_containers = stop_operation.stdout.split()
+        for container in stopped_containers:
             logging.info(f"Stopped container '{container}'.")
 
+        if stop_operation.returncode != 0:
+            logging.warning("Could not stop all containers of the stack: %s", stop_operation.stderr.strip())
+
     def stop(self,
              container: str = None,
              service: str = None
              ):
         """Stop the whole stack (if no container ID supplied; or a single container)"""
+        self.__invalidate_api_cache()
+
         if container is not None and service is None:
             self.__stop_docker_container_by_id(container)
             logging.debug(f"Stopping container {container}.")
@@ -1008,6 +1577,8 @@ class StableDraCor:
         if name not in ["api", "frontend", "metrics", "triplestore"]:
             logging.warning(f"Registering a non-canonical service: {name}")
 
+        self.__invalidate_api_cache()
+
         if self.__services[name] is None:
             self.__services[name] = dict(container=container)
         else:
@@ -1044,14 +1615,17 @@ class StableDraCor:
                                      base_image: str = None):
         """
         Helper Function to create Docker Labels to append when committing an image
-        Creates a string that can be used in the docker commit command with the option -c or --change, e.g.
-        LABEL multi.label1="value1" multi.label2="value2" other="value3"
+        Creates a list of LABEL instructions that can each be passed to the docker commit command with the
+        option -c or --change, e.g. LABEL multi.label1='value1'
 
         Args:
             service (str, optional): Name of the service for which the image the labels are created for.
                 Defaults to "api"
             this_image (str, optional): "New" image that the labels are created for
             base_image (str, optional): Image that the new image is based on (normally a canonical dracor-api image)
+
+        Returns:
+            list: LABEL instructions, one per label
         """
 
         manifest = self.get_manifest()
@@ -1061,81 +1635,55 @@ class StableDraCor:
         label_data["org.dracor.stable-dracor.version"] = manifest["version"]
 
         # Data of the System org.dracor.stable-dracor.system.*
-        label_data["org.dracor.stable-dracor.system.id"] = manifest["system"]["id"]
+        system = manifest["system"]
+        label_data["org.dracor.stable-dracor.system.id"] = system["id"]
 
-        if "name" in manifest["system"]:
-            label_data["org.dracor.stable-dracor.system.name"] = manifest["system"]["name"]
+        if (name := system.get("name")) is not None:
+            label_data["org.dracor.stable-dracor.system.name"] = name
 
-        if "description" in manifest["system"]:
-            label_data["org.dracor.stable-dracor.system.description"] = manifest["system"]["description"]
+        if (description := system.get("description")) is not None:
+            label_data["org.dracor.stable-dracor.system.description"] = description
 
-        if "timestamp" in manifest["system"]:
-            label_data["org.dracor.stable-dracor.system.timestamp"] = manifest["system"]["timestamp"]
+        if (timestamp := system.get("timestamp")) is not None:
+            label_data["org.dracor.stable-dracor.system.timestamp"] = timestamp
 
-        corpusnames = list(manifest["corpora"].keys())
-        if len(corpusnames) > 0:
-            label_data["org.dracor.stable-dracor.corpora"] = ",".join(corpusnames)
+        # str.join consumes the keys of a dict directly, no intermediate list is needed
+        corpora = manifest["corpora"]
+        if len(corpora) > 0:
+            label_data["org.dracor.stable-dracor.corpora"] = ",".join(corpora)
 
-        for corpus_key in corpusnames:
-            if "corpusname" in manifest["corpora"][corpus_key]:
-                label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.corpusname"
-                label_data[label_key] = manifest["corpora"][corpus_key]["corpusname"]
-            if "timestamp" in manifest["corpora"][corpus_key]:
-                label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.timestamp"
-                label_data[label_key] = manifest["corpora"][corpus_key]["timestamp"]
-            if "num_of_plays" in manifest["corpora"][corpus_key]:
-                label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.num-of-plays"
-                label_data[label_key] = str(manifest["corpora"][corpus_key]["num_of_plays"])
+        for corpus_key, corpus in corpora.items():
+            corpus_label_prefix = "org.dracor.stable-dracor.corpora." + corpus_key + "."
+
+            if (corpusname := corpus.get("corpusname")) is not None:
+                label_data[corpus_label_prefix + "corpusname"] = corpusname
+            if (timestamp := corpus.get("timestamp")) is not None:
+                label_data[corpus_label_prefix + "timestamp"] = timestamp
+            if (num_of_plays := corpus.get("num_of_plays")) is not None:
+                label_data[corpus_label_prefix + "num-of-plays"] = str(num_of_plays)
 
             # Sources of a corpus: org.dracor.stable-dracor.corpora.{corpusname}.sources.*
-            if "sources" in manifest["corpora"][corpus_key]:
-                label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources"
-                label_data[label_key] = ",".join(list(manifest["corpora"][corpus_key]["sources"].keys()))
+            if (sources := corpus.get("sources")) is not None:
+                label_data[corpus_label_prefix + "sources"] = ",".join(sources)
 
                 # Data of a source of a corpus: org.dracor.stable-dracor.corpora.{corpusname}.sources.{sourcename}.*
-                for source_key in manifest["corpora"][corpus_key]["sources"].keys():
-                    source = manifest["corpora"][corpus_key]["sources"][source_key]
-                    if "corpusname" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}.corpusname"
-                        label_data[label_key] = source["corpusname"]
-                    if "type" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}.type"
-                        label_data[label_key] = source["type"]
-                    if "url" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}.url"
-                        label_data[label_key] = source["url"]
-                    if "timestamp" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}.timestamp"
-                        label_data[label_key] = source["timestamp"]
-                    if "commit" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}.commit"
-                        label_data[label_key] = source["commit"]
-                    if "exclude" in source:
-                        if "type" in source["exclude"]:
-                            label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}." \
-                                        f"exclude.type"
-                            label_data[label_key] = source["exclude"]["type"]
-                        if "ids" in source["exclude"]:
-                            label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}." \
-                                        f"exclude.ids"
-                            label_data[label_key] = ",".join(source["exclude"]["ids"])
-                    if "include" in source:
-                        if "type" in source["include"]:
-                            label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}." \
-                                        f"include.type"
-                            label_data[label_key] = source["include"]["type"]
-                        if "ids" in source["include"]:
-                            label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}." \
-                                        f"include.ids"
-                            label_data[label_key] = ",".join(source["include"]["ids"])
-                    if "num_of_plays" in source:
-                        label_key = f"org.dracor.stable-dracor.corpora.{corpus_key}.sources.{source_key}." \
-                                    f"num-of-plays"
-                        label_data[label_key] = source["num_of_plays"]
+                for source_key, source in sources.items():
+                    source_label_prefix = corpus_label_prefix + "sources." + source_key + "."
+
+                    for field, label_suffix in self.__source_label_fields:
+                        if (value := source.get(field)) is not None:
+                            label_data[source_label_prefix + label_suffix] = str(value)
+
+                    for field in self.__source_label_id_list_fields:
+                        if (id_list := source.get(field)) is not None:
+                            if (id_type := id_list.get("type")) is not None:
+                                label_data[source_label_prefix + field + ".type"] = id_type
+                            if (ids := id_list.get("ids")) is not None:
+                                label_data[source_label_prefix + field + ".ids"] = ",".join(ids)
 
         # Data on the services: org.dracor.stable-dracor.services.*
         service_names = []
-        for service_key in manifest["services"].keys():
+        for service_key, service_data in manifest["services"].items():
             if service_key == service:
                 service_names.append(service)
                 if base_image is not None:
@@ -1146,35 +1694,26 @@ class StableDraCor:
                     label_data[label_key] = this_image
 
             else:
-                if manifest["services"][service_key] is not None:
+                if service_data is not None:
                     service_names.append(service_key)
-                    if "image" in manifest["services"][service_key]:
+                    if (image := service_data.get("image")) is not None:
                         label_key = f"org.dracor.stable-dracor.services.{service_key}.image"
-                        label_data[label_key] = manifest["services"][service_key]["image"]
+                        label_data[label_key] = image
 
         # Add additional info if committing API container
         if service == "api":
-            if "api" in manifest["services"]:
-                if "existdb" in manifest["services"]["api"]:
-                    label_key = f"org.dracor.stable-dracor.services.api.existdb"
-                    label_data[label_key] = manifest["services"]["api"]["existdb"]
-                if "version" in manifest["services"]["api"]:
-                    label_key = f"org.dracor.stable-dracor.services.api.version"
-                    label_data[label_key] = manifest["services"]["api"]["version"]
+            if (api := manifest["services"].get("api")) is not None:
+                if (existdb := api.get("existdb")) is not None:
+                    label_data["org.dracor.stable-dracor.services.api.existdb"] = existdb
+                if (version := api.get("version")) is not None:
+                    label_data["org.dracor.stable-dracor.services.api.version"] = version
 
         if len(service_names) > 0:
             # somehow json dumps does not work: tested json.dumps(service_names, separators=(',', ':'))
             label_data["org.dracor.stable-dracor.services"] = ",".join(service_names)
 
-        labels = []
-
-        for key in label_data.keys():
-            label_string = f'{key}="{label_data[key]}"'
-            labels.append(label_string)
-
-        joined_labels = "LABEL " + " ".join(labels)
-
-        return joined_labels
+        # Values are quoted, so that a value containing quotes or whitespace does not break the instruction
+        return [f"LABEL {key}={shlex.quote(str(value))}" for key, value in label_data.items()]
 
     def create_docker_image_of_service(self,
                                        service: str = "api",
@@ -1200,9 +1739,12 @@ class StableDraCor:
         logging.debug(f"Creating image of service '{service}'.")
 
         container_id = service_info["container"]
-        containers = self.list_docker_containers()
 
-        container_data = list(filter(lambda item: item["ID"] == container_id, containers))[0]
+        container_data = self.__get_docker_container_by_id(container_id)
+        if container_data is None:
+            logging.warning("Can not create image of service '%s'. Container %s not found.", service, container_id)
+            return None
+
         # logging.debug(container_data)
         container_state = container_data["State"]
         logging.debug(f"Container {container_id} is in state: {container_state}.")
@@ -1238,16 +1780,12 @@ class StableDraCor:
                                                    base_image=old_image,
                                                    this_image=new_image)
 
-        commit_operation = subprocess.run([
-            "docker",
-            "commit",
-            "-m",
-            f'"{commit_message}"',
-            "-c",
-            f"{labels}",
-            container_id,
-            new_image],
-            capture_output=True)
+        commit_command = ["docker", "commit", "-m", f'"{commit_message}"']
+        for label in labels:
+            commit_command.extend(["-c", label])
+        commit_command.extend([container_id, new_image])
+
+        commit_operation = subprocess.run(commit_command, capture_output=True)
 
         new_image_sha = commit_operation.stdout.decode("utf-8")
 
@@ -1280,8 +1818,20 @@ class StableDraCor:
 
         logging.debug(f"Following images will be pushed: {', '.join(self.__images_to_be_pushed)}.")
 
-        for image in self.__images_to_be_pushed:
-            push_operation = subprocess.run(["docker", "push", f"{image}"])
+        if len(self.__images_to_be_pushed) > 0:
+            # Pushing is bound by the network; upload the images concurrently
+            with ThreadPoolExecutor(max_workers=min(4, len(self.__images_to_be_pushed))) as executor:
+                push_operations = {executor.submit(subprocess.run, ["docker", "push", f"{image}"],
+                                                   capture_output=True): image
+                                   for image in self.__images_to_be_pushed}
+
+                for push_operation in as_completed(push_operations):
+                    image = push_operations[push_operation]
+                    if push_operation.result().returncode == 0:
+                        logging.debug("Pushed image %s.", image)
+                    else:
+                        logging.warning("Pushing image %s failed: %s", image,
+                                        push_operation.result().stderr.decode("utf-8"))
 
         logging.debug("Pushed images to DockerHub.")
         # reset
@@ -1380,13 +1930,21 @@ class StableDraCor:
 
     def __corpus_exists(self, corpusname: str) -> bool:
         """Helper function to check if a corpus exists.
-        The method checks if the provided identifier corpusname is in one of the fields "name" returned
-        by the /corpora endpoint
+        The method checks if the provided identifier corpusname equals one of the fields "name" returned
+        by the /corpora endpoint. The names are cached for a short time and the cache is discarded whenever data is
+        sent to the local API.
         """
         logging.debug(f"Invoked __corpus_exists. Checking for corpora with name '{corpusname}'.")
-        corpora = self.__api_get(method="corpora")
-        result = list(filter(lambda corpus: corpusname in corpus["name"], corpora))
-        if len(result) == 1:
+
+        if self.__corpus_names_cache is not None \
+                and time.monotonic() - self.__corpus_names_cache[0] < self.__corpus_names_cache_ttl:
+            corpus_names = self.__corpus_names_cache[1]
+        else:
+            corpora = self.__api_get(method="corpora")
+            corpus_names = {corpus["name"] for corpus in corpora}
+            self.__corpus_names_cache = (time.monotonic(), corpus_names)
+
+        if corpusname in corpus_names:
             logging.debug(f"Corpus '{corpusname}' exists.")
             return True
         else:
@@ -1423,9 +1981,7 @@ class StableDraCor:
 
         response = self.__api_post(
             corpus_metadata,
-            method="corpora",
-            username=self.__username,
-            password=self.__password)
+            method="corpora")
 
         if response == 200:
             logging.debug(f"Request to add corpus was successful.")
@@ -1439,14 +1995,13 @@ class StableDraCor:
                 logging.debug("Running check for metadata of local corpus.")
                 local_corpus_meta = self.__api_get(corpusname=corpus_metadata['name'])
 
-                errors = []
-                for field in corpus_metadata.keys():
-                    if field in local_corpus_meta:
-                        if local_corpus_meta[field] != corpus_metadata[field]:
-                            errors.append(field)
-                    else:
-                        logging.debug(f"Field {field} not in metadata of created corpus.")
-                        errors.append(field)
+                # Dict key views support set operations; values can be lists or dicts and are compared as they are
+                missing_fields = corpus_metadata.keys() - local_corpus_meta.keys()
+                if len(missing_fields) > 0:
+                    logging.debug("Fields %s not in metadata of created corpus.", ','.join(missing_fields))
+
+                errors = [field for field, value in corpus_metadata.items()
+                          if field in missing_fields or local_corpus_meta[field] != value]
                 logging.debug(f"Checked fields of metadata: {str(len(errors))} values did not match.")
                 if len(errors) == 0:
                     logging.info(f"Successfully created corpus {local_corpus_meta['name']}. All metadata is available "
@@ -1497,18 +2052,18 @@ class StableDraCor:
             logging.debug(f"Target corpus name not set explicitly, will use source name: {source_corpusname}.")
             target_corpusname = source_corpusname
 
-        source_plays = api_get(api_base_url=source_api_url, corpusname=source_corpusname)["dramas"]
+        source_plays = self.__get_source_corpus(source_api_url=source_api_url,
+                                                source_corpusname=source_corpusname)["dramas"]
         logging.debug(f"Retrieved metadata of {str(len(source_plays))} plays from source.")
 
         errors = []
         success = []
 
-        # Plays to exclude
-        if exclude is not None:
-            exclude = exclude
-        else:
-            exclude = []
-            # there are plays excluded, need to record that in the self.__corpora
+        # Plays to exclude; a set, so that checking each play of the source is a single lookup
+        # there are plays excluded, need to record that in the self.__corpora
+        exclude = set(exclude) if exclude else set()
+
+        plays_to_copy = []
 
         for play in source_plays:
             if play["name"] in exclude:
@@ -1520,31 +2075,37 @@ class StableDraCor:
                                                        id_type="slug",
                                                        id=play["name"])
             else:
-
+                plays_to_copy.append(play["name"])
+
+        # The URLs only differ by the playname; they are built once and filled in for each play
+        source_url_template = construct_request_url(api_base_url=source_api_url,
+                                                    corpusname=source_corpusname,
+                                                    playname="{playname}",
+                                                    method="tei")
+        target_url_template = construct_request_url(api_base_url=self.__api_base_url,
+                                                    corpusname=target_corpusname,
+                                                    playname="{playname}",
+                                                    method="tei")
+
+        # The plays are stored with the session directly; the cached API data is discarded once for all of them
+        self.__invalidate_api_cache()
+
+        # Copying is bound by the network; the plays are copied concurrently, at most one request per pooled connection
+        with ThreadPoolExecutor(max_workers=self.__http_pool_size) as executor:
+            copy_operations = {executor.submit(self.__copy_play,
+                                               source_url=source_url_template.format(playname=playname),
+                                               target_url=target_url_template.format(playname=playname)): playname
+                               for playname in plays_to_copy}
+
+            for copy_operation in as_completed(copy_operations):
+                playname = copy_operations[copy_operation]
                 try:
-                    logging.debug(f"Retrieving TEI of {play['name']}.")
-                    tei = api_get(
-                            api_base_url=source_api_url,
-                            corpusname=source_corpusname,
-                            playname=play["name"],
-                            method="tei")
-
-                    logging.debug(f"Storing TEI of {play['name']}.")
-
-                    self.__api_put(
-                            tei,
-                            method="tei",
-                            corpusname=target_corpusname,
-                            playname=play["name"],
-                            username=self.__username,
-                            password=self.__password,
-                            headers={"Content-Type": "application/xml"})
-
-                    success.append(play['name'])
-
-                except:
-                    logging.warning(f"Could not add  {play['name']} to corpus f{target_corpusname}.")
-                    errors.append(play["name"])
+                    copy_operation.result()
+                except (requests.RequestException, TimeoutError) as err:
+                    logging.warning("Could not add %s to corpus %s: %s", playname, target_corpusname, err)
+                    errors.append(playname)
+                else:
+                    success.append(playname)
 
         logging.info(f"Added contents of corpus {source_corpusname} from {source_api_url}. "
                      f"{len(success)} plays were added.")
@@ -1559,6 +2120,77 @@ class StableDraCor:
 
         logging.debug(f"There were {len(errors)} Errors.")
 
+    def __get_source_corpus(self,
+                            source_api_url: str,
+                            source_corpusname: str) -> dict:
+        """Helper function to get the metadata of a corpus, including the list of its plays ("dramas"), from another
+        DraCor API. The data is cached for the lifetime of the instance, so that copy_corpus and copy_corpus_contents
+        (or copying the same corpus again) request it only once. Data of the local API is not cached, it changes
+        while data is added.
+
+        Args:
+            source_api_url (str): Url of the API to copy from
+            source_corpusname (str): Identifier "corpusname" in the source system
+
+        Returns:
+            dict: Corpus metadata as returned by the API
+        """
+        if source_api_url.rstrip("/") == self.__api_base_url.rstrip("/"):
+            return self.__api_get(corpusname=source_corpusname)
+
+        cache_key = (source_api_url, source_corpusname)
+        if cache_key in self.__source_corpora:
+            logging.debug("Using cached metadata of corpus %s from %s.", source_corpusname, source_api_url)
+            return self.__source_corpora[cache_key]
+
+        corpus_metadata = api_get(api_base_url=source_api_url,
+                                  corpusname=source_corpusname,
+                                  session=self.__external_session)
+        self.__source_corpora[cache_key] = corpus_metadata
+
+        return corpus_metadata
+
+    def __copy_play(self,
+                    source_url: str,
+                    target_url: str):
+        """Helper function to copy the TEI of a single play from an API into a corpus of the local instance.
+        Raises a requests.RequestException (ConnectionError if a server does not respond with 200) if the play can
+        not be retrieved or stored. The message of the exception names the step that failed.
+
+        The TEI is passed on as it was received if it is UTF-8 or the source does not name the charset; other charsets
+        are converted to UTF-8, as in api_get. The cached data of the local API is not invalidated, this must be done
+        by the caller.
+
+        Args:
+            source_url (str): URL of the TEI of the play in the source API
+            target_url (str): URL of the TEI of the play in the local API
+        """
+        logging.debug("Retrieving TEI from %s.", source_url)
+        try:
+            r = self.__external_session.get(source_url)
+        except requests.RequestException as err:
+            raise ConnectionError(f"Retrieving TEI from {source_url} failed: {err}") from err
+
+        if r.status_code != 200:
+            raise ConnectionError(f"Retrieving TEI from {source_url} failed. "
+                                  f"Server returned status code: {r.status_code}", response=r)
+
+        # same rule as in api_get: only a body in another charset than UTF-8 is decoded and encoded again
+        if r.encoding is None or r.encoding.lower() in ("utf-8", "utf8"):
+            tei = r.content
+        else:
+            tei = r.text.encode("utf-8")
+
+        logging.debug("Storing TEI at %s.", target_url)
+        try:
+            r = self.__session.put(target_url, data=tei, headers={"Content-Type": "application/xml"})
+        except requests.RequestException as err:
+            raise ConnectionError(f"Storing TEI in the local API failed: {err}") from err
+
+        if r.status_code != 200:
+            raise ConnectionError(f"Storing TEI in the local API failed. "
+                                  f"Server returned status code: {r.status_code}", response=r)
+
     def __register_corpus(self,
                                 corpusname: str = None,
                                 source_name: str = None,
@@ -1584,13 +2216,13 @@ class StableDraCor:
             # TODO: decide if source will be added
         else:
             logging.debug(f"Registering corpus {corpusname} in self.__corpora.")
-            self.__corpora[corpusname] = dict(
+            corpus = dict(
                 corpusname=corpusname,
                 timestamp=datetime.now().isoformat()
             )
-            if source_name is not None or source_corpusname is not None:
+            self.__corpora[corpusname] = corpus
 
-                self.__corpora[corpusname]["sources"] = dict()
+            if source_name is not None or source_corpusname is not None:
 
                 source = dict()
 
@@ -1607,9 +2239,9 @@ class StableDraCor:
                 # is a source name is provided use this to identify the source,
                 # otherwise use the source corpus name
                 if source_name is not None:
-                    self.__corpora[corpusname]["sources"][source_name] = source
+                    corpus["sources"] = {source_name: source}
                 else:
-                    self.__corpora[corpusname]["sources"][source_corpusname] = source
+                    corpus["sources"] = {source_corpusname: source}
             else:
                 logging.debug(f"No source provided for corpus {corpusname}.")
 
@@ -1617,21 +2249,22 @@ class StableDraCor:
                                                       corpusname:str = None,
                                                       source_name: str = None,
                                                       num_of_plays: int = None):
-        """Helper function to add a play count to a source of a corpus in self.__corpora
-
-        Returns:
-
-        """
-        """
+        """Helper function to add a play count to a source of a corpus in self.__corpora, e.g.
         __register_added_play_number_in_corpus_source(corpusname=target_corpusname,
-                                                   source_name=source_corpusname,
-                                                  num_of_plays=len(success))
+                                                      source_name=source_corpusname,
+                                                      num_of_plays=len(success))
+
+        Args:
+            corpusname (str): Identifier "corpusname" of the registered corpus
+            source_name (str): Name of the source of the corpus
+            num_of_plays (int): Number of plays added from the source
         """
-        assert corpusname in self.__corpora, f"No such corpus '{corpusname}' registered in self.__corpora."
-        assert source_name in self.__corpora[corpusname]["sources"], f"Source {source_name} is not registered with " \
-                                                                     f" corpus {corpusname} in self.__corpora."
+        # a single lookup of the source; a missing corpus or source fails the same assertion
+        source = self.__corpora.get(corpusname, {}).get("sources", {}).get(source_name)
+        assert source is not None, f"Source {source_name} is not registered with corpus {corpusname} " \
+                                   f"in self.__corpora."
 
-        self.__corpora[corpusname]["sources"][source_name]["num_of_plays"] = num_of_plays
+        source["num_of_plays"] = num_of_plays
 
     def copy_corpus(self,
                     source_api_url: str = None,
@@ -1663,9 +2296,11 @@ class StableDraCor:
 
         # retrieve the metadata from the source corpus, default is https://dracor.org
         logging.debug("Retrieving corpus metadata.")
-        original_corpus_metadata = api_get(api_base_url=source_api_url, corpusname=source_corpusname)
+        original_corpus_metadata = self.__get_source_corpus(source_api_url=source_api_url,
+                                                            source_corpusname=source_corpusname)
 
-        new_corpus_metadata = original_corpus_metadata
+        # the fields are overwritten in a copy, the cached metadata stays as it was retrieved
+        new_corpus_metadata = dict(original_corpus_metadata)
         if metadata:
             logging.debug(f"Partially overwrite metadata:")
             for field in metadata.keys():
@@ -1699,9 +2334,9 @@ class StableDraCor:
             try:
                 local_corpus_data = self.__api_get(corpusname=new_corpus_metadata['name'])
                 logging.debug(f"Retrieving corpus {new_corpus_metadata['name']} works.")
-            except:
-                return False
+            except requests.RequestException:
                 logging.warning(f"Corpus {new_corpus_metadata['name']} is not available locally.")
+                return False
 
             if copy_contents is True:
                 logging.debug("Check if the number of plays are as expected:")
@@ -1739,9 +2374,7 @@ class StableDraCor:
 
         logging.debug(f"Removing corpus {corpusname}")
 
-        delete_status = self.__api_delete(corpusname=corpusname,
-                                          username=self.__username,
-                                          password=self.__password)
+        delete_status = self.__api_delete(corpusname=corpusname)
         if delete_status == 200:
             logging.info(f"Removed corpus {corpusname}.")
             # TODO: this should be reflected in self.__corpora
@@ -1783,20 +2416,30 @@ class StableDraCor:
     def add_plays_from_directory(self,
                                  corpusname: str,
                                  directory: str,
-                                 corpus_metadata: dict = None
+                                 corpus_metadata: dict = None,
+                                 validate: bool = True
                                  ):
         """Load local data and add it to a corpus identified by corpusnam.
         If the corpus does not exist, it will be created with minimal metadata.
 
+        The corpus is registered with a source named after a truncated hash of the names of the XML files in the
+        directory, in sorted order. Earlier versions hashed the names of all files in the order returned by the file
+        system. A source that was registered for the same directory by an earlier version, e.g. in a saved manifest,
+        can therefore have a different name.
+
         Args:
             corpusname (str): Identifier 'corpusname' of the corpus to add the plays to
             directory (str): Path to the local directory
             corpus_metadata (dict, optional): Metadata of the corpus to create
+            validate (bool, optional): Check that the files are well-formed XML before uploading them. Can be
+                switched off for trusted data; the API rejects files that are not well-formed. Defaults to True.
         """
 
         assert os.path.exists(directory), f"The directory {directory} does not exist."
 
-        files = os.listdir(directory)
+        # Only regular files with the extension ".xml" are imported; scandir gets the type along with the name
+        with os.scandir(directory) as entries:
+            files = [entry.name for entry in entries if entry.is_file() and entry.name.endswith(".xml")]
         logging.debug(files)
 
         logging.debug(f"Checking if corpus '{corpusname}' already exists.")
@@ -1826,9 +2469,13 @@ class StableDraCor:
             # maybe a truncated hash of the path?
             # another (better) option would be to hash the files
 
-            folder_content_string = ",".join(files)
-            #logging.debug(folder_content_string)
-            files_hashed = hashlib.sha1(folder_content_string.encode("UTF-8")).hexdigest()[:8]
+            # The names are hashed in sorted order, because the order returned by os.listdir depends on the system.
+            # They are fed to the hash one by one, separated by commas, instead of joining them to a single string
+            # first; the hash is the same as that of the joined string.
+            files_hash = hashlib.sha1()
+            for index, file in enumerate(sorted(files)):
+                files_hash.update((b"," if index > 0 else b"") + file.encode("UTF-8"))
+            files_hashed = files_hash.hexdigest()[:8]
             logging.debug(f"Registering corpus {corpusname}. Truncated hash of filenames in folder {directory} "
                           f"is: {files_hashed}")
             self.__register_corpus(corpusname=corpusname,
@@ -1840,42 +2487,24 @@ class StableDraCor:
         success = []
         errors = []
 
-        for file in files:
-            logging.debug(f"Importing {file} from directory {directory}.")
-            import_flag = True
-
-            filepath = directory + "/" + file
-            if ".xml" in file:
-                playname = file.split(".xml")[0]
-            else:
-                logging.debug("Maybe not an xml file according to the file extension.")
-                import_flag = False
-
-            # parsing the xml would not be necessary for import but this checks if the file is wellformed
-            # otherwise the API would reject it but I am not sure, what the API would return as error code
-            if import_flag is True:
+        # Uploading is bound by the network; the files are added concurrently
+        with ThreadPoolExecutor(max_workers=self.__http_pool_size) as executor:
+            import_operations = {executor.submit(self.__add_play_from_file,
+                                                 corpusname=corpusname,
+                                                 directory=directory,
+                                                 file=file,
+                                                 validate=validate): file
+                                 for file in files}
+
+            for import_operation in as_completed(import_operations):
+                file = import_operations[import_operation]
                 try:
-                    xml = ET.parse(filepath)
-                except ParseError:
-                    logging.warning(f"File at '{filepath}' is not well-formed XML. Can not add '{file}'."
-                                    f"Should also check if file extension is '.xml'!")
-                    import_flag = False
-
-            if import_flag is True:
-
-                with open(filepath, "r") as f:
-                    tei = f.read().encode("utf-8")
-                    self.__api_put(
-                        tei,
-                        method="tei",
-                        corpusname=corpusname,
-                        playname=playname,
-                        username=self.__username,
-                        password=self.__password,
-                        headers={"Content-Type": "application/xml"})
-
-                success.append(file)
-                logging.info(f"Added TEI data from file '{file}' to corpus '{corpusname}'.")
+                    if import_operation.result() is True:
+                        success.append(file)
+                        logging.info("Added TEI data from file '%s' to corpus '%s'.", file, corpusname)
+                except (requests.RequestException, OSError) as err:
+                    logging.warning("Could not add TEI data from file '%s' to corpus '%s': %s", file, corpusname, err)
+                    errors.append(file)
 
         if len(errors) == 0:
             logging.info(f"Imported {str(len(success))} files from {directory} as corpus '{corpusname}'.")
@@ -1886,6 +2515,51 @@ class StableDraCor:
             logging.debug(errors)
             return False
 
+    def __add_play_from_file(self,
+                             corpusname: str,
+                             directory: str,
+                             file: str,
+                             validate: bool = True) -> bool:
+        """Helper function to add a single TEI file (*.xml) from a local directory to a corpus.
+        Raises an exception if the file can not be uploaded.
+
+        Args:
+            corpusname (str): Identifier 'corpusname' of the corpus to add the play to
+            directory (str): Path to the local directory
+            file (str): Name of the file in the directory
+            validate (bool, optional): Check that the file is well-formed XML before uploading it. Defaults to True.
+
+        Returns:
+            bool: True if the file was added, False if it was skipped because it is not a well-formed XML file
+        """
+        logging.debug("Importing %s from directory %s.", file, directory)
+
+        filepath = directory + "/" + file
+        playname = file.removesuffix(".xml")
+
+        with open(filepath, "rb") as f:
+            if validate is True:
+                # parsing the xml would not be necessary for import but this checks if the file is wellformed
+                # otherwise the API would reject it but I am not sure, what the API would return as error code
+                # The file is read once; the same bytes are checked while they are read and then sent
+                tei = _read_well_formed_xml(f)
+                if tei is None:
+                    logging.warning("File at '%s' is not well-formed XML. Can not add '%s'.", filepath, file)
+                    return False
+            else:
+                # The open file is passed as body; requests streams it from the file. The size is taken from the
+                # file for the Content-Length header.
+                tei = f
+
+            self.__api_put(
+                tei,
+                method="tei",
+                corpusname=corpusname,
+                playname=playname,
+                headers={"Content-Type": "application/xml"})
+
+        return True
+
     def __get_unsafe_characters(self, check: str = None) -> list:
         """Helper Function to check for problematic characters
 
@@ -1945,7 +2619,8 @@ class StableDraCor:
                                    repository_blob_base_url: str = "raw.githubusercontent.com",
                                    protocol: str = "https",
                                    check: bool = True,
-                                   verbose: bool = True) -> bool:
+                                   verbose: bool = True,
+                                   validate: bool = True) -> bool:
         """Add a play in a certain version from a git repository defined by a git commit to a corpus.
 
         Args:
@@ -1965,11 +2640,53 @@ class StableDraCor:
             protocol (str, optional): Protocol used in the request url. Defaults to "https"
             check (bool, optional): Additional check if the play has been successfully added. Defaults to True.
             verbose (bool, optional): Log verbose info messages. Defaults to True.
+            validate (bool, optional): Check that the retrieved data is well-formed XML before sending it to the
+                local API. Can be switched off for trusted repositories; the API rejects data that is not well-formed.
+                Defaults to True.
 
         TODO: This kind of addition is not reflected in self.__corpora. Register that. Or: Maybe not, don't know.
         TODO: this is not using GitHub API but constructing the URL to retrieve the data. This might be not the best option.
         """
 
+        # the target corpus is created if it does not exist yet; see __add_play_version for the default corpusname
+        corpusname_of_play = corpusname or repository_name
+        if corpusname_of_play is not None:
+            self.__create_corpus_if_missing(corpusname_of_play)
+
+        return self.__add_play_version(corpusname=corpusname,
+                                       playname=playname,
+                                       commit=commit,
+                                       filename=filename,
+                                       repository_name=repository_name,
+                                       repository_owner=repository_owner,
+                                       repository_data_folder=repository_data_folder,
+                                       repository_blob_base_url=repository_blob_base_url,
+                                       protocol=protocol,
+                                       check=check,
+                                       verbose=verbose,
+                                       validate=validate)
+
+    def __add_play_version(self,
+                           corpusname: str = None,
+                           playname: str = None,
+                           commit: str = None,
+                           filename: str = None,
+                           repository_name: str = None,
+                           repository_owner: str = "dracor-org",
+                           repository_data_folder: str = "tei",
+                           repository_blob_base_url: str = "raw.githubusercontent.com",
+                           protocol: str = "https",
+                           check: bool = True,
+                           verbose: bool = True,
+                           validate: bool = True) -> bool:
+        """Helper function to add a play in a certain version from a git repository to a corpus that already exists.
+        Used by add_play_version_to_corpus and add_play_versions_to_corpus, which create the target corpora first.
+        See add_play_version_to_corpus for the arguments.
+
+        Returns:
+            bool: True if the play has been added.
+        """
+
         assert repository_name is not None, "Providing the name of a repository (repository_name) is required."
         assert filename is not None, "Providing a file name (filename) is required."
 
@@ -1987,21 +2704,23 @@ class StableDraCor:
 
         logging.debug(f"Fetching github data from source url: {source_url}")
 
-        r = requests.get(url=source_url)
+        # The session keeps the connection to the server open; plays added one after another (or concurrently with
+        # add_play_versions_to_corpus) re-use the pooled connections instead of a new TLS handshake per file
+        r = self.__external_session.get(url=source_url)
         if r.status_code == 200:
             import_flag = True
-            tei = r.text.encode("utf-8")
+            # the file as it is stored in the repository
+            tei = r.content
             logging.debug(f"Could retrieve data from '{source_url}'.")
         else:
             import_flag = False
             logging.debug(f"Retrieving data from '{source_url}' failed. Server returned: {str(r.status_code)}.")
 
-        # try to parse xml
-        if import_flag is True:
-            try:
-                xml = ET.fromstring(tei)
+        # try to parse xml; the data is only run through the parser, no tree is built
+        if import_flag is True and validate is True:
+            if _is_well_formed_xml_data(tei):
                 logging.debug("Could parse returned data. XML is well-formed.")
-            except ParseError:
+            else:
                 logging.warning(f"File at url '{source_url}' is not well-formed XML. Can not add it to the database.")
                 import_flag = False
 
@@ -2010,14 +2729,6 @@ class StableDraCor:
                           f" Using the name of the repository '{repository_name}' as name of the corpus.")
             corpusname = repository_name
 
-        if self.__corpus_exists(corpusname) is False:
-            logging.debug(f"Must create corpus '{corpusname}'.")
-            new_corpus_metadata = {"name": corpusname,
-                                   "title": "Automatically generated corpus",
-                                   "description": "This corpus has been created automatically "
-                                                  "because it did not exist during an import operation."}
-            self.add_corpus(corpus_metadata=new_corpus_metadata, check=False)
-
         if playname is None:
             playname = filename.replace(".xml", "")
             logging.debug(f"Identifier 'playname' of the play is not set. Will use filename '{filename}' as "
@@ -2040,8 +2751,6 @@ class StableDraCor:
                 method="tei",
                 corpusname=corpusname,
                 playname=playname,
-                username=self.__username,
-                password=self.__password,
                 headers={"Content-Type": "application/xml"})
 
             if add_status == 200:
@@ -2057,7 +2766,7 @@ class StableDraCor:
         if check is True and import_flag is True:
             logging.debug(f"Checking if play '{playname}' has been added to corpus '{corpusname}'.")
             added_play = self.__api_get(corpusname=corpusname, playname=playname)
-            if type(added_play) == dict:
+            if isinstance(added_play, dict):
                 # This is the common message, if verbose is set to false, there will be no logging
                 if verbose is True:
                     logging.info(f"Play '{playname}' retrieved from '{source_url}' has been successfully added "
@@ -2077,29 +2786,152 @@ class StableDraCor:
             logging.debug("This else statement should not be reachable.")
             return False
 
-    def __get_latest_commit_hash_in_github_repo(self,
-                                                repository_name: str,
-                                                repository_owner: str = "dracor-org") -> str:
-        """Use the GitHUb API to get the commit-ID of the latest commit on a repository.
-        The method will get Github commits by using /repos/{owner}/{name}/commits. We assume that the first entry in
-        this list is the latest commit, but we have to tested it yet.
+    def add_play_versions_to_corpus(self,
+                                    plays: list,
+                                    max_workers: int = 8,
+                                    **kwargs) -> list:
+        """Add several plays in a certain version from git repositories to corpora. The plays are retrieved and added
+        concurrently, see add_play_version_to_corpus.
+
+        Example:
+            add_play_versions_to_corpus([{"filename": "lessing-emilia-galotti", "commit": "a1b2c3"},
+                                         {"filename": "schiller-die-raeuber"}],
+                                        repository_name="gerdracor", corpusname="ger")
+
+        Args:
+            plays (list): Arguments of add_play_version_to_corpus for each play as dict, e.g. filename, commit
+            max_workers (int, optional): Number of plays that are added at the same time. Defaults to 8, which keeps
+                the number of concurrent requests to GitHub low.
+            **kwargs: Arguments of add_play_version_to_corpus that are the same for all plays, e.g. repository_name
+
+        Returns:
+            list: Result of add_play_version_to_corpus for each play, in the order of plays
+        """
+        play_arguments = [{**kwargs, **play} for play in plays]
+
+        # Corpora are created before the plays are added; otherwise concurrent calls would try to create the same
+        # corpus several times
+        corpusnames = {arguments.get("corpusname") or arguments.get("repository_name") for arguments in play_arguments}
+        for corpusname in corpusnames:
+            if corpusname is not None:
+                self.__create_corpus_if_missing(corpusname)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda arguments: self.__add_play_version(**arguments), play_arguments))
+
+        logging.info("Added %s of %s plays.", results.count(True), len(results))
+
+        return results
+
+    def __create_corpus_if_missing(self, corpusname: str):
+        """Helper function to create a corpus with generic metadata if it does not exist in the local instance.
+
+        Args:
+            corpusname (str): Identifier 'corpusname' of the corpus
+        """
+        if self.__corpus_exists(corpusname) is False:
+            logging.debug("Must create corpus '%s'.", corpusname)
+            new_corpus_metadata = {"name": corpusname,
+                                   "title": "Automatically generated corpus",
+                                   "description": "This corpus has been created automatically "
+                                                  "because it did not exist during an import operation."}
+            self.add_corpus(corpus_metadata=new_corpus_metadata, check=False)
+
+    def __get_latest_commit_and_tree(self,
+                                     repository_name: str,
+                                     repository_owner: str = "dracor-org",
+                                     branch: str = None) -> tuple:
+        """Use the GitHub API to get the commit-ID and the SHA of the root tree of the latest commit on a branch.
+        The method will get the first page of /repos/{owner}/{name}/commits with a single entry, which is the latest
+        commit on the branch. If no branch is set, the default branch of the repository is used. Unlike
+        /commits/{branch}, the list does not include the changed files of the commit. The result is re-used for a
+        short time, so that importing several corpora from the same repository does not request it again.
 
         For example, a commit hash is necessary to retrieve the tree and thus the files at a given point in time.
 
         Args:
-            repository_owner (str, optional): User owning the repository. Defaults to "dracor-org"
             repository_name (str): Name of the repository.
+            repository_owner (str, optional): User owning the repository. Defaults to "dracor-org"
+            branch (str, optional): Name of the branch. Defaults to the default branch of the repository.
 
-        TODO: Investigate if the first returned commit is the latest commit indeed.
+        Returns:
+            tuple: Commit-ID and SHA of the tree of the root folder at this commit; (None, None) if the request failed.
         """
-        get_commits_api_call = f"repos/{repository_owner}/{repository_name}/commits"
+        cache_key = (repository_owner, repository_name, branch)
+        if cache_key in self.__latest_commits \
+                and time.monotonic() - self.__latest_commits[cache_key][0] < self.__latest_commit_cache_ttl:
+            logging.debug("Using cached latest commit of repo '%s/%s'.", repository_owner, repository_name)
+            return self.__latest_commits[cache_key][1]
+
+        get_commits_api_call = f"repos/{repository_owner}/{repository_name}/commits?per_page=1"
+        if branch is not None:
+            get_commits_api_call = f"{get_commits_api_call}&sha={branch}"
+
         data = self.__github_api_get(api_call=get_commits_api_call)
 
-        if data is not None:
-            commit_data = data[0]
-            commit_hash = commit_data["sha"]
-            logging.debug(f"Retrieved latest (?) commit of repo '{repository_owner}/{repository_name}': {commit_hash}.")
-            return commit_hash
+        if not data:
+            logging.warning("Could not retrieve the latest commit of repo '%s/%s'.", repository_owner, repository_name)
+            return None, None
+
+        commit_data = data[0]
+        commit_hash = commit_data["sha"]
+        tree_sha = commit_data["commit"]["tree"]["sha"]
+        logging.debug("Retrieved latest commit of repo '%s/%s' (branch: %s): %s (tree: %s).",
+                      repository_owner, repository_name, branch, commit_hash, tree_sha)
+        self.__latest_commits[cache_key] = (time.monotonic(), (commit_hash, tree_sha))
+        return commit_hash, tree_sha
+
+    def __get_raw_file_at_commit(self,
+                                 commit: str,
+                                 path: str,
+                                 repository_name: str,
+                                 repository_owner: str = "dracor-org") -> bytes:
+        """Helper function to get the raw contents of a file in a GitHub repository at a given commit.
+        The file is retrieved from raw.githubusercontent.com, which does not use the rate limit of the GitHub API.
+
+        Args:
+            commit (str): Commit-ID (or branch name) identifying the version of the file.
+            path (str): Path of the file from the root folder of the repository.
+            repository_name (str): Name of the repository.
+            repository_owner (str, optional): User owning the repository. Defaults to "dracor-org"
+
+        Returns:
+            bytes: Contents of the file; None if it could not be retrieved.
+        """
+        raw_file_url = f"https://raw.githubusercontent.com/{repository_owner}/{repository_name}/{commit}/{path}"
+
+        r = self.__external_session.get(url=raw_file_url)
+        if r.status_code == 200:
+            logging.debug("Retrieved raw file from '%s'.", raw_file_url)
+            return r.content
+        else:
+            logging.debug("Retrieving raw file from '%s' failed. Server returned: %s.", raw_file_url, r.status_code)
+            return None
+
+    def __get_github_tree(self,
+                          tree_sha: str,
+                          repository_name: str,
+                          repository_owner: str = "dracor-org",
+                          recursive: bool = False) -> dict:
+        """Use the GitHub API to get a git tree. Trees are kept for the lifetime of the instance, see __github_api_get.
+
+        The Git Trees API accepts any tree-ish, e.g. a commit-ID, a branch name or the SHA of a tree. Thus, the tree of
+        the root folder of a repository can be retrieved directly by a commit-ID without requesting the commit first.
+
+        Args:
+            tree_sha (str): Commit-ID, branch name or SHA of the tree.
+            repository_name (str): Name of the repository.
+            repository_owner (str, optional): User owning the repository. Defaults to "dracor-org"
+            recursive (bool, optional): Include the contents of all sub-folders. Defaults to False.
+
+        Returns:
+            dict: Tree data as returned by the GitHub API
+        """
+        get_tree_api_call = f"repos/{repository_owner}/{repository_name}/git/trees/{tree_sha}"
+        if recursive is True:
+            get_tree_api_call = f"{get_tree_api_call}?recursive=1"
+
+        return self.__github_api_get(api_call=get_tree_api_call)
 
     def list_plays_in_repo(self,
                                   commit: str = None,
@@ -2123,67 +2955,186 @@ class StableDraCor:
         """
         assert repository_name is not None, "Providing a repository name is mandatory!"
 
+        # The Git Trees API accepts the commit-ID as tree-ish. If the latest commit is requested, we get the SHA of
+        # the root tree along with it and use this one instead.
+        root_tree_sha = commit
         if commit is None:
             logging.debug("No commit set. Getting latest commit.")
-            commit = self.__get_latest_commit_hash_in_github_repo(repository_name=repository_name,
-                                                                  repository_owner=repository_owner)
+            commit, root_tree_sha = self.__get_latest_commit_and_tree(repository_name=repository_name,
+                                                                      repository_owner=repository_owner)
         if repository_base_url != "github.com":
             logging.critical(f"Not using Github. This is only implemented for the Github API. Will probably fail.")
 
-        logging.debug(f"Using Github to get the commit {commit} and the tree object thereof.")
-        get_commit_api_call = f"repos/{repository_owner}/{repository_name}/commits/{commit}"
-        commit_data = self.__github_api_get(api_call=get_commit_api_call)
-        tree = commit_data["commit"]["tree"]
-        logging.debug(f"Got the Github tree of commit '{commit}': {tree['sha']} at url {tree['url']}.")
+        logging.debug(f"Using Github to get the tree of commit {commit}.")
+
+        # A single recursive tree contains the paths of all files in the repository, thus the data folder does not
+        # need to be looked up in the tree of the root folder first. This also works for nested data folders.
+        repository_tree = self.__get_github_tree(tree_sha=root_tree_sha,
+                                                 repository_name=repository_name,
+                                                 repository_owner=repository_owner,
+                                                 recursive=True)
+
+        if not isinstance(repository_tree, dict):
+            logging.warning("GET request to get the tree of the repository failed!")
+            return []
+
+        return self.__list_plays_from_tree(repository_tree=repository_tree,
+                                           commit=commit,
+                                           repository_name=repository_name,
+                                           repository_owner=repository_owner,
+                                           repository_data_folder=repository_data_folder)
+
+    def __list_plays_from_tree(self,
+                               repository_tree: dict,
+                               commit: str,
+                               repository_name: str,
+                               repository_owner: str = "dracor-org",
+                               repository_data_folder: str = "tei") -> list:
+        """Helper function to list TEI-XML files in the data folder of a repository from its recursive tree.
+        If the tree is truncated, the contents of the data folder are requested separately.
 
-        if "/" in repository_data_folder:
-            logging.critical(f"Getting data in nested directories is not implemented. Can only get the contents of"
-                             f" a single data folder contained in the repository root.")
+        Args:
+            repository_tree (dict): Recursive tree of the repository at the commit as returned by the GitHub API
+            commit (str): Commit-ID representing the state of the repository.
+            repository_name (str): Name of the repository
+            repository_owner: Username of the user owning the repository. Defaults to "dracor-org"
+            repository_data_folder: Path from root to folder containing the play data. Defaults to "tei"
+
+        Returns:
+            list: File names of the plays in the data folder
+        """
+        if repository_tree["truncated"] is True:
+            logging.warning("Not all items of the repository are included in the recursive tree. Will get the "
+                            f"contents of the data folder '{repository_data_folder}' instead.")
 
-        # get the tree and then the hash of the tree of the sub-folder
-        repository_root_folder = self.__github_api_get(url=tree["url"])
+            # The GraphQL API returns all entries of a folder at once, but can only be used with an access token
+            if self.__github_access_token is not None and commit is not None:
+                filenames = self.__list_plays_in_github_folder_with_graphql(
+                    commit=commit,
+                    repository_name=repository_name,
+                    repository_owner=repository_owner,
+                    repository_data_folder=repository_data_folder)
+                if filenames is not None:
+                    return filenames
 
-        # this is not the very best check in the world
-        if type(repository_root_folder) == dict:
-            if repository_root_folder["truncated"] is True:
-                logging.warning("Not all items in the root folder of the repository are included in the response.")
+            return self.__list_plays_in_github_folder(root_tree_sha=repository_tree["sha"],
+                                                      repository_name=repository_name,
+                                                      repository_owner=repository_owner,
+                                                      repository_data_folder=repository_data_folder)
 
-            tree_objects_in_root_folder = repository_root_folder["tree"]
-            data_folder_object = list(filter(lambda item: item["path"] == repository_data_folder,
-                                             tree_objects_in_root_folder))[0]
-            logging.debug(data_folder_object)
-            logging.debug(f"Found data folder '{repository_data_folder}' in tree objects. "
-                          f" sha: {data_folder_object['sha']}, url: {data_folder_object['url']}.")
+        data_folder = repository_data_folder.strip("/")
 
-        else:
-            logging.warning(f"GET request to get the data '{repository_data_folder}' folder failed!")
-            data_folder_object = None
+        # exclude directories, files that are not XML and files in sub-folders of the data folder
+        filenames = [item["path"][len(data_folder) + 1:] for item in repository_tree["tree"]
+                     if item["type"] == "blob" and item["path"].endswith(".xml")
+                     and item["path"].rpartition("/")[0] == data_folder]
+
+        logging.debug("Found %s files in the data folder '%s'.", len(filenames), repository_data_folder)
+        return filenames
+
+    def __list_plays_in_github_folder_with_graphql(self,
+                                                   commit: str,
+                                                   repository_name: str,
+                                                   repository_owner: str = "dracor-org",
+                                                   repository_data_folder: str = "tei") -> list:
+        """Helper function to list TEI-XML files in the data folder with a single request to the GitHub GraphQL API.
+        Unlike the Git Trees API, the entries of the folder are not truncated. Requires a personal access token.
+
+        Args:
+            commit (str): Commit-ID (or branch name) identifying the state of the repository.
+            repository_name (str): Name of the repository
+            repository_owner: Username of the user owning the repository. Defaults to "dracor-org"
+            repository_data_folder: Path from root to folder containing the play data. Defaults to "tei"
+
+        Returns:
+            list: File names of the plays in the data folder; None if the request failed.
+        """
+        query = "query($owner: String!, $name: String!, $expression: String!) {" \
+                " repository(owner: $owner, name: $name) {" \
+                " object(expression: $expression) { ... on Tree { entries { name type } } } } }"
+        variables = {"owner": repository_owner,
+                     "name": repository_name,
+                     "expression": f"{commit}:{repository_data_folder.strip('/')}"}
+
+        r = self.__github_session.post(url="https://api.github.com/graphql",
+                                       json={"query": query, "variables": variables})
+
+        if r.status_code != 200:
+            logging.debug("GraphQL request to GitHub was not successful. Server returned: %s.", r.status_code)
+            return None
+
+        data = r.json().get("data") or {}
+        data_folder = (data.get("repository") or {}).get("object")
+        if data_folder is None or "entries" not in data_folder:
+            logging.debug("Could not get the entries of the data folder '%s' with GraphQL.", repository_data_folder)
+            return None
+
+        # exclude directories
+        filenames = [entry["name"] for entry in data_folder["entries"]
+                     if entry["type"] == "blob" and entry["name"].endswith(".xml")]
+        logging.debug("Found %s files in the data folder with GraphQL.", len(filenames))
+
+        return filenames
+
+    def __list_plays_in_github_folder(self,
+                                      root_tree_sha: str,
+                                      repository_name: str,
+                                      repository_owner: str = "dracor-org",
+                                      repository_data_folder: str = "tei") -> list:
+        """Helper function to list TEI-XML files by walking down the trees of the folders to the data folder.
+        This is used if the recursive tree of a repository is truncated by the GitHub API.
+
+        Args:
+            root_tree_sha (str): Commit-ID or SHA of the tree of the root folder.
+            repository_name (str): Name of the repository
+            repository_owner: Username of the user owning the repository. Defaults to "dracor-org"
+            repository_data_folder: Path from root to folder containing the play data. Defaults to "tei"
+
+        Returns:
+            list: File names of the plays in the data folder
+        """
+        tree_sha = root_tree_sha
 
-        if data_folder_object is not None:
-            logging.debug(f"Getting files in the data folder.")
-            parsed_data_folder_tree_object = self.__github_api_get(url=data_folder_object["url"])
+        for folder_name in repository_data_folder.strip("/").split("/"):
+            folder_tree = self.__get_github_tree(tree_sha=tree_sha,
+                                                 repository_name=repository_name,
+                                                 repository_owner=repository_owner)
 
             # This is not the very best check in the world
-            if type(parsed_data_folder_tree_object) == dict:
+            if not isinstance(folder_tree, dict):
+                logging.warning("GET request to get the tree containing the folder '%s' failed!", folder_name)
+                return []
 
-                if parsed_data_folder_tree_object["truncated"] is True:
-                    logging.warning("The contents of the TEI folder are paged! Need to implement!")
+            if folder_tree["truncated"] is True:
+                logging.warning("Not all items in the folder are included in the response.")
 
-                file_objects = parsed_data_folder_tree_object["tree"]
-                logging.debug(f"Found {len(file_objects)} in the data folder tree.")
+            folder_object = next((item for item in folder_tree["tree"]
+                                  if item["path"] == folder_name and item["type"] == "tree"), None)
+            if folder_object is None:
+                logging.warning("Could not find the folder '%s' in the repository.", folder_name)
+                return []
 
-                filenames = []
+            logging.debug("Found folder '%s' in tree objects. sha: %s.", folder_name, folder_object['sha'])
+            tree_sha = folder_object["sha"]
 
-                for item in file_objects:
-                    # exclude directories
-                    if item["type"] == "blob":
-                        filenames.append(item["path"])
+        data_folder_tree = self.__get_github_tree(tree_sha=tree_sha,
+                                                  repository_name=repository_name,
+                                                  repository_owner=repository_owner)
 
-            else:
-                logging.warning(f"GET request to retrieve the contents of the data folder failed.")
-                filenames = []
+        # This is not the very best check in the world
+        if not isinstance(data_folder_tree, dict):
+            logging.warning("GET request to retrieve the contents of the data folder failed.")
+            return []
+
+        if data_folder_tree["truncated"] is True:
+            logging.warning("The contents of the TEI folder are paged! Need to implement!")
+
+        # exclude directories
+        filenames = [item["path"] for item in data_folder_tree["tree"]
+                     if item["type"] == "blob" and item["path"].endswith(".xml")]
+        logging.debug("Found %s files in the data folder tree.", len(filenames))
 
-            return filenames
+        return filenames
 
     def __exclude_play_from_corpus_source(self,
                                           id: str = None,
@@ -2199,43 +3150,32 @@ class StableDraCor:
             source_name (str): Name of the source of the corpus ins self.__corpora
             id_type (str): Type of ID. Defaults to "slug", but can be "id" if it is a DraCor ID, e.g. "ger12345"
                 Using anything else than slug is currently not recommended.
-        TODO: this would need to be refactored. There is a really deeply nested if/else structure.
         """
 
         assert corpusname in self.__corpora, f"Identifier corpusname {corpusname} is not registered in self.__corpora"
 
-        if "sources" in self.__corpora[corpusname]:
-            if source_name in self.__corpora[corpusname]["sources"]:
-                if "exclude" in self.__corpora[corpusname]["sources"][source_name]:
-                    # check if excluding of same ID type
-                    if "type" in self.__corpora[corpusname]["sources"][source_name]["exclude"]:
-                        # check if excluding the same type
-                        if self.__corpora[corpusname]["sources"][source_name]["exclude"]["type"] != id_type:
-                            # TODO: decide if raise Exception here because this is bad.
-                            logging.warning("Using different ID types to identify plays to exclude. This will "
-                                            "cause problems!")
-                        else:
-                            # all fine, check if IDs already have been excluded
-                            if "ids" in self.__corpora[corpusname]["sources"][source_name]["exclude"]:
-                                self.__corpora[corpusname]["sources"][source_name]["exclude"]["ids"].append(id)
-                            else:
-                                logging.debug("Strangely everything is set, but no IDs are listed to be excluded.")
-                                self.__corpora[corpusname]["sources"][source_name]["exclude"]["ids"] = [id]
-                    else:
-                        logging.warning("There might be something excluded before but the type of ID has not been set.")
-                        self.__corpora[corpusname]["sources"][source_name]["exclude"]["type"] = id_type
-                else:
-                    # need to add exclude dictionary and the substructures because it is the first time a play
-                    # is excluded from this source
-                    self.__corpora[corpusname]["sources"][source_name]["exclude"] = dict()
-                    self.__corpora[corpusname]["sources"][source_name]["exclude"]["type"] = id_type
-                    self.__corpora[corpusname]["sources"][source_name]["exclude"]["ids"] = [id]
-            else:
-                logging.warning(f"Source with name '{source_name}' is not registered with the sources of the corpus "
-                                f"{corpusname}.")
-
-        else:
+        sources = self.__corpora[corpusname].get("sources")
+        if sources is None:
             logging.warning("Strangely there are not sources registered in the corpus.")
+            return
+
+        source = sources.get(source_name)
+        if source is None:
+            logging.warning("Source with name '%s' is not registered with the sources of the corpus %s.",
+                            source_name, corpusname)
+            return
+
+        # the first time a play is excluded from this source, the type of ID is set
+        exclude = source.setdefault("exclude", dict(type=id_type, ids=[]))
+
+        # check if excluding of same ID type
+        if exclude.setdefault("type", id_type) != id_type:
+            # TODO: decide if raise Exception here because this is bad.
+            logging.warning("Using different ID types to identify plays to exclude. This will "
+                            "cause problems!")
+            return
+
+        exclude.setdefault("ids", []).append(id)
 
     def add_corpus_from_repo(self,
                              commit: str = None,
@@ -2256,6 +3196,9 @@ class StableDraCor:
             repository_base_url: Base of the repository. If it is the default "github.com", the Github API will be used.
             repository_data_folder (str, optional): Path to the folder containing the files. Defaults to "tei"
             use_metadata_of_corpus_xml (bool, optional): Use the file "corpus.xml" in the root folder for metadata.
+                The identifier "corpusname" in corpus.xml is also used as the name of the source of the new corpus.
+                If corpus_metadata is complete and the source can be named after the repository, set it to False to
+                skip retrieving corpus.xml.
             corpus_metadata (dict, optional): Metadata to overwrite corpus metadata with.
             exclude (list, optional): File names (without file extension .xml) of plays to exclude from new corpus.
 
@@ -2267,79 +3210,61 @@ class StableDraCor:
 
         if commit is None:
             logging.debug("No commit set. Getting latest commit.")
-            commit = self.__get_latest_commit_hash_in_github_repo(repository_name=repository_name,
-                                                                  repository_owner=repository_owner)
+            commit, _ = self.__get_latest_commit_and_tree(repository_name=repository_name,
+                                                          repository_owner=repository_owner)
 
+        root_folder_tree_data = None
         if use_metadata_of_corpus_xml is True:
             logging.debug(f"Get the repository root folder tree at commit '{commit}'.")
 
-            get_commit_api_call = f"repos/{repository_owner}/{repository_name}/commits/{commit}"
-            commit_data = self.__github_api_get(api_call=get_commit_api_call)
-
-            if type(commit_data) == dict:
-                tree = commit_data["commit"]["tree"]
-                logging.debug(f"Got the Github tree of commit '{commit}': {tree['sha']} at url {tree['url']}.")
-            else:
-                logging.debug(f"Getting the tree from GitHub was not successful.")
-                tree = None
-
-            if tree is not None:
-                root_folder_tree_data = self.__github_api_get(url=tree["url"])
+            # The recursive tree is re-used to list the plays
+            root_folder_tree_data = self.__get_github_tree(tree_sha=commit,
+                                                           repository_name=repository_name,
+                                                           repository_owner=repository_owner,
+                                                           recursive=True)
 
-                if type(root_folder_tree_data) == dict:
-                    items = root_folder_tree_data["tree"]
-                    corpus_xml_object = list(filter(lambda item: item["path"] == "corpus.xml",
-                                             items))[0]
-                    # logging.debug(corpus_xml_object)
+            if isinstance(root_folder_tree_data, dict):
+                items = root_folder_tree_data["tree"]
+                corpus_xml_object = next((item for item in items if item["path"] == "corpus.xml"), None)
+                # logging.debug(corpus_xml_object)
 
-                    if corpus_xml_object["type"] == "blob":
-                        corpus_xml_blob_url = corpus_xml_object["url"]
-                        logging.debug(f"Found corpus.xml blob at {corpus_xml_blob_url}.")
-                    else:
-                        logging.debug(f"Could not find url of corpus.xml blob.")
-                        corpus_xml_blob_url = None
+                if corpus_xml_object is not None and corpus_xml_object["type"] == "blob":
+                    corpus_xml_blob_url = corpus_xml_object["url"]
+                    logging.debug(f"Found corpus.xml blob at {corpus_xml_blob_url}.")
                 else:
-                    logging.debug(f"Requesting the tree of the root folder was not successful.")
+                    logging.debug(f"Could not find url of corpus.xml blob.")
                     corpus_xml_blob_url = None
+            else:
+                logging.debug(f"Requesting the tree of the root folder was not successful.")
+                corpus_xml_blob_url = None
 
+            corpus_xml_data = None
             if corpus_xml_blob_url is not None:
-                # TODO: Continue here. Need to change to get_github_api stuff
-                blob_data = self.__github_api_get(url=corpus_xml_blob_url)
-                if "content" in blob_data:
-                    corpus_xml_string = base64.b64decode(blob_data["content"])
-                    corpus_xml = ET.fromstring(corpus_xml_string)
-                else:
+                # The raw file does not count against the rate limit of the GitHub API and is not base64 encoded
+                corpus_xml_data = self.__get_raw_file_at_commit(commit=commit,
+                                                                  path="corpus.xml",
+                                                                  repository_name=repository_name,
+                                                                  repository_owner=repository_owner)
+
+                if corpus_xml_data is None:
+                    # e.g. private repositories can only be accessed with the GitHub API
+                    logging.debug("Could not retrieve raw corpus.xml. Will use the GitHub API.")
+                    blob_data = self.__github_api_get(url=corpus_xml_blob_url)
+                    if blob_data is not None and "content" in blob_data:
+                        # the content is decoded while it is parsed
+                        corpus_xml_data = _iter_base64_decoded(blob_data["content"])
+
+                if corpus_xml_data is None:
                     logging.warning(f"Could not decode and parse corpus.xml. Operation might fail.")
-                    corpus_xml = None
 
-            if corpus_xml is not None:
-                ns = {"tei": "http://www.tei-c.org/ns/1.0"}
+            existing_corpus_metadata = None
+            if corpus_xml_data is not None:
                 logging.debug("Extracting corpus metadata from corpus.xml.")
-
-                existing_corpus_metadata = {}
-
-                corpus_title_e = corpus_xml.find("tei:teiHeader/tei:fileDesc/tei:titleStmt/tei:title", ns)
-                if corpus_title_e is not None:
-                    corpus_title = corpus_title_e.text
-                    existing_corpus_metadata["title"] = corpus_title
-                    logging.debug(f"Title: {corpus_title}")
-
-                corpus_name_e = corpus_xml.find("tei:teiHeader/tei:fileDesc/tei:publicationStmt/tei:idno[@type='URI']",
-                                                ns)
-                if corpus_name_e is not None:
-                    corpus_name = corpus_name_e.text
-                    existing_corpus_metadata["name"] = corpus_name
-                    logging.debug(f"Corpusname: {corpus_name}")
-
-                corpus_desc_elems = corpus_xml.findall("tei:teiHeader/tei:encodingDesc/tei:projectDesc/tei:p", ns)
-                if len(corpus_desc_elems) != 0:
-                    corpus_desc_texts = []
-                    for elem in corpus_desc_elems:
-                        corpus_desc_texts.append(elem.text)
-                    corpus_desc_text = "".join(corpus_desc_texts)
-                    existing_corpus_metadata["description"] = corpus_desc_text
-                    logging.debug(f"Description: {corpus_desc_text}")
-                    # TODO: this ignores included sub-elements, e.g. links
+                try:
+                    existing_corpus_metadata = _extract_corpus_metadata(corpus_xml_data)
+                    logging.debug("Corpus metadata in corpus.xml: %s", existing_corpus_metadata)
+                except ParseError:
+                    logging.warning("Could not parse corpus.xml. Operation might fail.")
 
                 # TODO: Extract other metadata, e.g. licence, licenceUrl, and whatnot
         else:
@@ -2379,7 +3304,27 @@ class StableDraCor:
                           f" '{repository_name}'.")
             new_corpusmetadata["name"] = repository_name
 
-        create_corpus_status = self.add_corpus(corpus_metadata=new_corpusmetadata, check=False)
+        # Creating the corpus in the local API and listing the files in the repository are independent requests;
+        # send them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            create_corpus_future = executor.submit(self.add_corpus, corpus_metadata=new_corpusmetadata, check=False)
+
+            if isinstance(root_folder_tree_data, dict):
+                filenames_future = executor.submit(self.__list_plays_from_tree,
+                                                   repository_tree=root_folder_tree_data,
+                                                   commit=commit,
+                                                   repository_owner=repository_owner,
+                                                   repository_name=repository_name,
+                                                   repository_data_folder=repository_data_folder)
+            else:
+                filenames_future = executor.submit(self.list_plays_in_repo,
+                                                   commit=commit,
+                                                   repository_owner=repository_owner,
+                                                   repository_name=repository_name,
+                                                   repository_base_url=repository_base_url,
+                                                   repository_data_folder=repository_data_folder)
+
+        create_corpus_status = create_corpus_future.result()
         if create_corpus_status is True:
             # register the corpus self.__register_corpus()
             # This registers an added corpus in self.__corpora (only the metadata and the source, not it's contents)
@@ -2405,11 +3350,7 @@ class StableDraCor:
                                    source_commit=commit,
                                    source_url=f"https://{repository_base_url}/{repository_owner}/{repository_name}")
 
-        filenames = self.list_plays_in_repo(commit=commit,
-                                            repository_owner=repository_owner,
-                                            repository_name=repository_name,
-                                            repository_base_url=repository_base_url,
-                                            repository_data_folder=repository_data_folder)
+        filenames = filenames_future.result()
         logging.debug(f"Got {len(filenames)} filenames from repo {repository_owner}/{repository_name}.")
 
         success = []
@@ -2421,43 +3362,51 @@ class StableDraCor:
         else:
             logging.debug(f"Should exclude {', '.join(exclude)}.")
 
+        # Slugs of the plays to exclude; a set, so that checking each file is a single lookup
+        excluded_slugs = {item[:-4] if item.endswith(".xml") else item for item in exclude}
+
+        included_filenames = []
+
         for filename in filenames:
-            if filename in exclude or f"{filename}.xml" in exclude or filename.replace(".xml", "") in exclude:
+            slug = filename[:-4] if filename.endswith(".xml") else filename
+            if slug in excluded_slugs:
                 logging.debug(f"File {filename} is excluded.")
-                if filename.endswith(".xml"):
-                    slug = filename[:-4]
-                else:
-                    slug = filename
 
                 # Exclude the file also from the source in self.__corpora
                 self.__exclude_play_from_corpus_source(corpusname=new_corpusmetadata["name"],
                                                        source_name=source_name,
                                                        id_type="slug",
                                                        id=slug)
-                pass
             else:
                 # This is what normally happens if a file is not explicitly excluded
-                add_file_status = self.add_play_version_to_corpus(
-                    corpusname=new_corpusmetadata["name"],
-                    commit=commit,
-                    filename=filename,
-                    repository_name=repository_name,
-                    repository_owner=repository_owner)
-                if add_file_status is True:
-                    success.append(filename)
+                included_filenames.append(filename)
+
+        # The files are retrieved and added concurrently. The results are handled here, thus only this thread
+        # modifies self.__corpora
+        plays = [{"filename": filename} for filename in included_filenames]
+        add_file_statuses = self.add_play_versions_to_corpus(plays,
+                                                             corpusname=new_corpusmetadata["name"],
+                                                             commit=commit,
+                                                             repository_name=repository_name,
+                                                             repository_owner=repository_owner,
+                                                             repository_data_folder=repository_data_folder)
+
+        for filename, add_file_status in zip(included_filenames, add_file_statuses):
+            if add_file_status is True:
+                success.append(filename)
+            else:
+                # There was an error with the file, need to exclude them in self.__corpora as well
+                errors.append(filename)
+                if filename.endswith(".xml"):
+                    slug = filename[:-4]
                 else:
-                    # There was an error with the file, need to exclude them in self.__corpora as well
-                    errors.append(filename)
-                    if filename.endswith(".xml"):
-                        slug = filename[:-4]
-                    else:
-                        slug = filename
+                    slug = filename
 
-                    # Exclude the file also from the source in self.__corpora
-                    self.__exclude_play_from_corpus_source(corpusname=new_corpusmetadata["name"],
-                                                           source_name=source_name,
-                                                           id_type="slug",
-                                                           id=slug)
+                # Exclude the file also from the source in self.__corpora
+                self.__exclude_play_from_corpus_source(corpusname=new_corpusmetadata["name"],
+                                                       source_name=source_name,
+                                                       id_type="slug",
+                                                       id=slug)
 
         # TODO: this might log a count to self.__corpora source; should use len(success)
         # TODO: should log the number of plays successfully added to the source
@@ -2528,8 +3477,8 @@ class StableDraCor:
 
         if commit is None:
             logging.debug("No commit set. Getting latest commit.")
-            commit = self.__get_latest_commit_hash_in_github_repo(repository_name=repository_name,
-                                                                  repository_owner=repository_owner)
+            commit, _ = self.__get_latest_commit_and_tree(repository_name=repository_name,
+                                                          repository_owner=repository_owner)
 
         # Register source in corpus data in self.__corpora
         logging.debug(f"Registering source of corpus {corpusname}.")
@@ -2574,13 +3523,13 @@ class StableDraCor:
         else:
             logging.debug(f"Should exclude {', '.join(exclude)}.")
 
+        # Slugs of the plays to exclude; a set, so that checking each file is a single lookup
+        excluded_slugs = {item[:-4] if item.endswith(".xml") else item for item in exclude}
+
         for filename in filenames:
-            if filename in exclude or f"{filename}.xml" in exclude or filename.replace(".xml", "") in exclude:
+            slug = filename[:-4] if filename.endswith(".xml") else filename
+            if slug in excluded_slugs:
                 logging.debug(f"File {filename} is excluded.")
-                if filename.endswith(".xml"):
-                    slug = filename[:-4]
-                else:
-                    slug = filename
 
                 # Exclude the file also from the source in self.__corpora
                 self.__exclude_play_from_corpus_source(corpusname=corpusname,
@@ -2602,10 +3551,6 @@ class StableDraCor:
                 else:
                     # There was an error with the file, need to exclude them in self.__corpora as well
                     errors.append(filename)
-                    if filename.endswith(".xml"):
-                        slug = filename[:-4]
-                    else:
-                        slug = filename
 
                     # Exclude the file also from the source in self.__corpora
                     self.__exclude_play_from_corpus_source(corpusname=corpusname,